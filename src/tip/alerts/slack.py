@@ -1,14 +1,38 @@
 from __future__ import annotations
 
+import atexit
+import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict
 from slack_sdk.webhook import WebhookClient
 
+logger = logging.getLogger(__name__)
 
-def send_slack(message: str, severity: int = 50) -> None:
-    url = os.getenv("SLACK_WEBHOOK_URL")
-    if not url:
-        return
-    if severity < 80:
-        # quiet by default, only high severity
-        return
-    WebhookClient(url).send(text=message)
+# Read once at import; changing SLACK_WEBHOOK_URL afterwards requires a restart/reload
+_URL = os.getenv("SLACK_WEBHOOK_URL")
+
+# One client per webhook URL; sends run off the caller's thread so alerting never
+# blocks the hot path
+_client_cache: Dict[str, WebhookClient] = {}
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="slack")
+atexit.register(_executor.shutdown)
+
+
+def _send(client: WebhookClient, message: str) -> None:
+    try:
+        resp = client.send(text=message)
+        if resp.status_code != 200:
+            logger.warning(f"Slack webhook returned {resp.status_code}: {resp.body}")
+    except Exception:
+        logger.exception("Slack webhook send failed")
+
+
+def send_slack(message: str, severity: int = 50) -> Future | None:
+    # quiet by default, only high severity
+    if severity < 80 or not _URL:
+        return None
+    client = _client_cache.get(_URL)
+    if client is None:
+        client = _client_cache.setdefault(_URL, WebhookClient(_URL))
+    return _executor.submit(_send, client, message)
@@ -1,25 +1,34 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
-from sqlalchemy import select
+from sqlalchemy import update
 from tip.db.session import get_session_sync
 from tip.db.models import Outbox
 from tip.bus.sqs import SQSBus
 
 
 def dispatch_once(dsn: str, bus: SQSBus, batch_size: int = 100) -> int:
-    dispatched = 0
     with get_session_sync(dsn)() as session:
+        # Plain DBAPI tuples: no ORM hydration or identity-map bookkeeping per row.
+        # SKIP LOCKED lets several dispatcher replicas claim disjoint batches.
         rows = (
-            session.execute(
-                select(Outbox).where(Outbox.published_at.is_(None)).order_by(Outbox.outbox_id).limit(batch_size)
+            session.connection()
+            .exec_driver_sql(
+                "SELECT outbox_id, payload FROM outbox WHERE published_at IS NULL "
+                "ORDER BY outbox_id LIMIT %s FOR UPDATE SKIP LOCKED",
+                (batch_size,),
             )
-            .scalars()
-            .all()
+            .fetchall()
         )
-        for row in rows:
-            bus.publish(row.payload)
-            row.published_at = datetime.now(timezone.utc)
-            dispatched += 1
-    return dispatched
+        if not rows:
+            return 0
+        # Only rows SQS accepted are marked; failures stay pending for the next cycle
+        sent = bus.publish_many([payload for _, payload in rows])
+        if sent:
+            session.execute(
+                update(Outbox)
+                .where(Outbox.outbox_id.in_([rows[i][0] for i in sent]))
+                .values(published_at=datetime.now(timezone.utc))
+                .execution_options(synchronize_session=False)
+            )
+    return len(sent)
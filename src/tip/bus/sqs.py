@@ -1,10 +1,54 @@
 from __future__ import annotations
 
-import json
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import os
 import boto3
+import orjson
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+# SQS SendMessageBatch accepts at most 10 entries and 256 KiB of bodies per call
+SQS_MAX_BATCH = 10
+SQS_MAX_BATCH_BYTES = 256 * 1024
+
+# Retries of failed batch entries wait a random 0..min(cap, base * 2**attempt) seconds
+# ("full jitter"), so throttled entries don't burn every retry within milliseconds
+SQS_RETRY_BASE_SECONDS = 0.1
+SQS_RETRY_MAX_SECONDS = 5.0
+
+# boto3 clients are thread-safe; share one per (region, endpoint, pool size) so every
+# bus in the process reuses the same keep-alive connection pool
+_clients: Dict[Tuple[str, Optional[str], int], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(region: str, endpoint: Optional[str], max_pool_connections: int):
+    key = (region, endpoint, max_pool_connections)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = boto3.client(
+                "sqs",
+                region_name=region,
+                endpoint_url=endpoint,
+                config=Config(
+                    max_pool_connections=max_pool_connections,
+                    tcp_keepalive=True,
+                    connect_timeout=3,
+                    read_timeout=10,
+                    retries={"max_attempts": 5, "mode": "adaptive"},
+                ),
+            )
+            _clients[key] = client
+    return client
 
 
 @dataclass
@@ -13,13 +57,170 @@ class SQSConfig:
     dlq_url: Optional[str] = None
     region: str = "us-east-1"
     endpoint_url: Optional[str] = None
+    max_retries: int = 3
+    max_pool_connections: int = 10
 
 
 class SQSBus:
     def __init__(self, cfg: SQSConfig):
         self.cfg = cfg
         endpoint = cfg.endpoint_url or os.getenv("AWS_ENDPOINT_URL")
-        self.client = boto3.client("sqs", region_name=cfg.region, endpoint_url=endpoint)
+        self.client = _get_client(cfg.region, endpoint, cfg.max_pool_connections)
+
+    def publish(self, payload: dict) -> None:
+        if not self.publish_many([payload]):
+            raise RuntimeError(f"Failed to publish message to {self.cfg.queue_url}")
+
+    def publish_batch(self, payloads: List[Dict[str, Any]]) -> None:
+        """Publish up to 10 payloads in one SendMessageBatch; raise if any were rejected."""
+        sent = self.publish_many(payloads)
+        if len(sent) < len(payloads):
+            raise RuntimeError(
+                f"Failed to publish {len(payloads) - len(sent)} of {len(payloads)} messages to {self.cfg.queue_url}"
+            )
+
+    def publish_many(self, payloads: List[Dict[str, Any]]) -> List[int]:
+        """Publish payloads with SendMessageBatch, up to 10 (and 256 KiB) per call.
+
+        Returns the indexes (into ``payloads``) of messages SQS accepted. Entries
+        reported in ``Failed`` are retried up to ``cfg.max_retries`` times, with
+        jittered exponential backoff, unless SQS flags them as a sender fault
+        (those would fail the same way again).
+        """
+        bodies = [orjson.dumps(payload) for payload in payloads]
+        sent: List[int] = []
+        for batch in _batches([len(body) for body in bodies]):
+            pending = {str(i): bodies[i].decode() for i in batch}
+            for attempt in range(self.cfg.max_retries + 1):
+                resp = self.client.send_message_batch(
+                    QueueUrl=self.cfg.queue_url,
+                    Entries=[{"Id": entry_id, "MessageBody": body} for entry_id, body in pending.items()],
+                )
+                sent.extend(int(ok["Id"]) for ok in resp.get("Successful", []))
+                failed = resp.get("Failed", [])
+                retryable = {f["Id"] for f in failed if not f.get("SenderFault")}
+                for f in failed:
+                    logger.warning(
+                        f"SQS batch entry {f['Id']} failed (attempt {attempt + 1}): "
+                        f"{f.get('Code')} {f.get('Message', '')}"
+                    )
+                pending = {entry_id: pending[entry_id] for entry_id in retryable}
+                if not pending or attempt == self.cfg.max_retries:
+                    break
+                time.sleep(random.uniform(0, min(SQS_RETRY_MAX_SECONDS, SQS_RETRY_BASE_SECONDS * 2**attempt)))
+        sent.sort()
+        return sent
+
+
+def _batches(sizes: List[int]) -> Iterator[range]:
+    """Split message indexes into runs that fit one SendMessageBatch call."""
+    start, total = 0, 0
+    for i, size in enumerate(sizes):
+        if i > start and (i - start == SQS_MAX_BATCH or total + size > SQS_MAX_BATCH_BYTES):
+            yield range(start, i)
+            start, total = i, 0
+        total += size
+    if start < len(sizes):
+        yield range(start, len(sizes))
+
+
+_FLUSH = object()
+_STOP = object()
+
+
+class BufferedSQSBus:
+    """Client-side send buffering over an SQSBus, akin to AmazonSQSBufferedAsyncClient.
+
+    ``publish()`` enqueues and returns immediately. A background thread groups
+    messages into batches of up to ``max_batch`` (or whatever arrived within
+    ``linger_ms``) and sends them on a pool of ``max_inflight_batches`` workers.
+    With ``max_queued`` set, ``publish()`` blocks once that many messages are
+    waiting, so a fast producer can't outrun SQS unboundedly. Call ``flush()``
+    to wait for everything enqueued so far, and ``close()`` on shutdown.
+    """
+
+    def __init__(
+        self,
+        bus: SQSBus,
+        max_batch: int = 10,
+        linger_ms: int = 200,
+        max_inflight_batches: int = 5,
+        max_queued: int = 0,
+    ):
+        self.bus = bus
+        self.max_batch = min(max_batch, SQS_MAX_BATCH)
+        self.linger = linger_ms / 1000
+        self.failed = 0
+        self._failed_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._inflight = threading.BoundedSemaphore(max_inflight_batches)
+        self._pool = ThreadPoolExecutor(max_workers=max_inflight_batches, thread_name_prefix="sqs-batch")
+        self._worker = threading.Thread(target=self._run, name="sqs-buffer", daemon=True)
+        self._worker.start()
 
     def publish(self, payload: dict) -> None:
-        self.client.send_message(QueueUrl=self.cfg.queue_url, MessageBody=json.dumps(payload))
+        self._queue.put(payload)
+
+    def publish_batch(self, payloads: List[Dict[str, Any]]) -> None:
+        # Already batched downstream; delivery failures are counted in ``failed``
+        for payload in payloads:
+            self._queue.put(payload)
+
+    def publish_many(self, payloads: List[Dict[str, Any]]) -> List[int]:
+        # Callers that need per-message results bypass the buffer
+        self.flush()
+        return self.bus.publish_many(payloads)
+
+    def flush(self) -> None:
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._worker.is_alive():
+            self._queue.put(_STOP)
+            self._queue.join()
+            self._worker.join()
+        self._pool.shutdown(wait=True)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[Dict[str, Any]] = []
+            deadline = time.monotonic() + self.linger
+            while item is not _FLUSH and item is not _STOP:
+                batch.append(item)
+                timeout = deadline - time.monotonic()
+                if len(batch) >= self.max_batch or timeout <= 0:
+                    item = None
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                    break
+            if batch:
+                self._submit(batch)
+            if item is not None:
+                # Marker: its task_done lands after the batches ahead of it are submitted
+                self._queue.task_done()
+                if item is _STOP:
+                    return
+
+    def _submit(self, batch: List[Dict[str, Any]]) -> None:
+        self._inflight.acquire()
+        future = self._pool.submit(self.bus.publish_many, batch)
+        future.add_done_callback(lambda f: self._on_sent(f, len(batch)))
+
+    def _on_sent(self, future, size: int) -> None:
+        try:
+            sent = len(future.result())
+        except Exception:
+            logger.exception("SQS batch send failed")
+            sent = 0
+        if sent < size:
+            with self._failed_lock:
+                self.failed += size - sent
+            logger.error(f"{size - sent} of {size} buffered SQS messages were not delivered")
+        self._inflight.release()
+        for _ in range(size):
+            self._queue.task_done()
@@ -1,17 +1,71 @@
 from __future__ import annotations
 
-import json
+import logging
+import sys
 import time
 from datetime import datetime, timedelta, timezone
+from typing import Callable
+import orjson
 import typer
 from tip.utils.config import Settings
 from tip.storage.s3 import S3Client, S3Config
-from tip.bus.sqs import SQSBus, SQSConfig
+from tip.bus.sqs import SQS_MAX_BATCH, BufferedSQSBus, SQSBus, SQSConfig
 from tip.connectors.wsb_mock import WSBMockConnector
 from tip.connectors.base import ConnectorConfig
 
 app = typer.Typer(add_completion=False)
 
+# Per-cycle stats go through one pre-built handler/formatter rather than formatting a
+# timestamped line by hand each cycle; UTC ISO timestamps match the old echo output
+_log = logging.getLogger("tip.cli")
+_log.setLevel(logging.INFO)
+_log.propagate = False
+_handler = logging.StreamHandler(sys.stdout)
+_formatter = logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%dT%H:%M:%S%z")
+_formatter.converter = time.gmtime
+_handler.setFormatter(_formatter)
+_log.addHandler(_handler)
+
+
+def _loop_every(fn: Callable[[], bool | None], interval: float, max_cycles: int = 0) -> int:
+    """Call ``fn`` every ``interval`` seconds on a monotonic schedule.
+
+    The time ``fn`` takes is deducted from the following sleep, so the period stays
+    ``interval`` instead of drifting to ``interval + work``. If ``fn`` returns True
+    (more work is already waiting) the next cycle starts immediately. Runs forever
+    unless ``max_cycles`` > 0; returns the number of cycles run.
+    """
+    cycles = 0
+    next_tick = time.monotonic()
+    while True:
+        next_tick += interval
+        run_again = fn()
+        cycles += 1
+        if max_cycles > 0 and cycles >= max_cycles:
+            return cycles
+        now = time.monotonic()
+        if run_again or next_tick <= now:
+            # Restart the schedule from now rather than bursting to catch up
+            next_tick = now
+            continue
+        time.sleep(next_tick - now)
+
+
+def _run_connector_forever(c, interval: int, name: str) -> None:
+    def cycle() -> None:
+        try:
+            stats = c.run_once()
+            _log.info("%s", orjson.dumps(stats).decode())
+        except Exception as e:
+            typer.echo(f"Error during connector run: {e}", err=True)
+
+    try:
+        _loop_every(cycle, interval)
+    except KeyboardInterrupt:
+        typer.echo(f"\nShutting down {name}")
+    finally:
+        c.close()
+
 
 @app.command()
 def run_wsb(mode: str = typer.Option("shadow", help="shadow or emit")):
@@ -31,20 +85,44 @@ def run_wsb(mode: str = typer.Option("shadow", help="shadow or emit")):
     )
     c = WSBMockConnector(cfg, s3, bus)
     stats = c.run_once()
-    typer.echo(json.dumps(stats))
+    typer.echo(orjson.dumps(stats).decode())
 
 
 @app.command()
-def replay_last_minutes(minutes: int = 60):
+def replay_last_minutes(
+    minutes: int = 60,
+    use_copy: bool = typer.Option(False, "--copy", help="Extract with COPY (faster for very wide windows)"),
+):
     """Replay events from the last N minutes to SQS."""
-    from tip.replay.replay import replay_by_ts_ingested
+    from tip.replay.replay import replay_by_ts_ingested, replay_copy
 
     s = Settings()
-    bus = SQSBus(SQSConfig(queue_url=s.SQS_QUEUE_URL, dlq_url=s.SQS_DLQ_URL, region=s.AWS_REGION))
+    # 16 batches in flight on a 32-connection client; the bounded queue stalls the
+    # DB cursor instead of buffering the whole window when SQS is the bottleneck
+    bus = BufferedSQSBus(
+        SQSBus(
+            SQSConfig(
+                queue_url=s.SQS_QUEUE_URL,
+                dlq_url=s.SQS_DLQ_URL,
+                region=s.AWS_REGION,
+                max_pool_connections=32,
+            )
+        ),
+        max_inflight_batches=16,
+        max_queued=32 * SQS_MAX_BATCH,
+    )
     end = datetime.now(timezone.utc)
     start = end - timedelta(minutes=minutes)
-    cnt = replay_by_ts_ingested(s.PG_DSN, bus, start, end)
+    try:
+        if use_copy:
+            cnt = replay_copy(s.PG_DSN, bus, start, end)
+        else:
+            cnt = replay_by_ts_ingested(s.PG_DSN, bus, start, end)
+    finally:
+        bus.close()
     typer.echo(f"Replayed {cnt} events")
+    if bus.failed:
+        typer.echo(f"Warning: {bus.failed} events failed to publish", err=True)
 
 
 @app.command()
@@ -66,42 +144,34 @@ def dispatch_outbox(
         raise typer.Exit(1)
 
     bus = SQSBus(SQSConfig(queue_url=s.SQS_QUEUE_URL, dlq_url=s.SQS_DLQ_URL, region=s.AWS_REGION))
-    
-    cycles = 0
-    total_dispatched = 0
-    
+    stats = {"cycles": 0, "total_dispatched": 0}
+
     typer.echo(f"Starting outbox dispatcher (batch_size={batch_size}, interval={interval}s)")
-    
-    while True:
+
+    def cycle() -> bool:
+        stats["cycles"] += 1
         try:
             dispatched = dispatch_once(s.PG_DSN, bus, batch_size=batch_size)
-            total_dispatched += dispatched
-            cycles += 1
-            
-            if dispatched > 0:
-                typer.echo(f"[{datetime.now(timezone.utc).isoformat()}] Dispatched {dispatched} messages (total: {total_dispatched})")
-            
-            # One-shot mode
-            if interval == 0:
-                break
-            
-            # Max cycles limit
-            if max_cycles > 0 and cycles >= max_cycles:
-                typer.echo(f"Reached max cycles ({max_cycles}), exiting")
-                break
-            
-            time.sleep(interval)
-            
-        except KeyboardInterrupt:
-            typer.echo(f"\nShutting down. Total dispatched: {total_dispatched}")
-            break
         except Exception as e:
             typer.echo(f"Error during dispatch: {e}", err=True)
             if interval == 0:
                 raise typer.Exit(1)
-            time.sleep(interval)  # Back off on error
-    
-    typer.echo(json.dumps({"cycles": cycles, "total_dispatched": total_dispatched}))
+            return False  # Back off on error
+        stats["total_dispatched"] += dispatched
+        if dispatched > 0:
+            _log.info("Dispatched %d messages (total: %d)", dispatched, stats["total_dispatched"])
+        # A full batch means the outbox is backlogged: refill without sleeping
+        return dispatched == batch_size
+
+    try:
+        # One-shot mode when interval is 0
+        _loop_every(cycle, interval, max_cycles=1 if interval == 0 else max_cycles)
+        if interval and max_cycles > 0:
+            typer.echo(f"Reached max cycles ({max_cycles}), exiting")
+    except KeyboardInterrupt:
+        typer.echo(f"\nShutting down. Total dispatched: {stats['total_dispatched']}")
+
+    typer.echo(orjson.dumps(stats).decode())
 
 
 @app.command()
@@ -117,11 +187,30 @@ def serve_metrics(
     uvicorn.run(metrics_app, host=host, port=port, log_level="info")
 
 
+def _apply_migrations(engine, migration_files) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Read files concurrently, apply them serially in order
+    with ThreadPoolExecutor() as pool:
+        migration_sql = list(pool.map(lambda f: f.read_text(), migration_files))
+
+    with engine.begin() as conn:
+        # Straight to the DBAPI with no parameters at all: no SQLAlchemy statement
+        # parsing, and psycopg doesn't scan the script for placeholders, so a literal
+        # % (LIKE 'a%', or in a comment) goes through as written
+        conn = conn.execution_options(no_parameters=True)
+        for migration_file, sql in zip(migration_files, migration_sql):
+            typer.echo(f"Running migration: {migration_file.name}")
+            started = time.perf_counter()
+            conn.exec_driver_sql(sql)
+            typer.echo(f"  ✓ {migration_file.name} completed in {time.perf_counter() - started:.3f}s")
+
+
 @app.command()
 def migrate():
     """Run database migrations."""
     from pathlib import Path
-    from sqlalchemy import create_engine, text
+    from sqlalchemy import create_engine
     
     s = Settings()
     if not s.PG_DSN:
@@ -132,14 +221,7 @@ def migrate():
     engine = create_engine(s.PG_DSN)
     
     migrations_dir = Path(__file__).parent / "db" / "migrations"
-    migration_files = sorted(migrations_dir.glob("*.sql"))
-    
-    with engine.begin() as conn:
-        for migration_file in migration_files:
-            typer.echo(f"Running migration: {migration_file.name}")
-            sql = migration_file.read_text()
-            conn.execute(text(sql))
-            typer.echo(f"  ✓ {migration_file.name} completed")
+    _apply_migrations(engine, sorted(migrations_dir.glob("*.sql")))
     
     typer.echo("All migrations completed successfully!")
 
@@ -148,6 +230,7 @@ def migrate():
 def run_connector_loop(
     mode: str = typer.Option("shadow", help="shadow or emit"),
     interval: int = typer.Option(60, help="Seconds between connector runs"),
+    bulk: bool = typer.Option(False, "--bulk", help="Backfill mode: COPY outbox rows instead of INSERT"),
 ):
     """Run the WSB connector in a continuous loop.
     
@@ -167,22 +250,13 @@ def run_connector_loop(
         s3_bucket=s.S3_BUCKET,
         dsn=s.PG_DSN,
         sqs_queue_url=s.SQS_QUEUE_URL,
+        bulk=bulk,
     )
     c = WSBMockConnector(cfg, s3, bus)
     
-    typer.echo(f"Starting connector loop (mode={mode}, interval={interval}s)")
+    typer.echo(f"Starting connector loop (mode={mode}, interval={interval}s, bulk={bulk})")
     
-    while True:
-        try:
-            stats = c.run_once()
-            typer.echo(f"[{datetime.now(timezone.utc).isoformat()}] {json.dumps(stats)}")
-            time.sleep(interval)
-        except KeyboardInterrupt:
-            typer.echo("\nShutting down connector")
-            break
-        except Exception as e:
-            typer.echo(f"Error during connector run: {e}", err=True)
-            time.sleep(interval)  # Back off on error
+    _run_connector_forever(c, interval, "connector")
 
 
 @app.command()
@@ -213,22 +287,42 @@ def run_reddit(
         sqs_queue_url=s.SQS_QUEUE_URL,
     )
     
-    subreddit_list = [s.strip() for s in subreddits.split(",")]
+    subreddit_list = tuple(sys.intern(name.strip()) for name in subreddits.split(",") if name.strip())
     c = RedditConnector(cfg, s3, bus, subreddits=subreddit_list)
     
     typer.echo(f"Starting Reddit connector (mode={mode}, interval={interval}s, subreddits={subreddit_list})")
     
-    while True:
-        try:
-            stats = c.run_once()
-            typer.echo(f"[{datetime.now(timezone.utc).isoformat()}] {json.dumps(stats)}")
-            time.sleep(interval)
-        except KeyboardInterrupt:
-            typer.echo("\nShutting down Reddit connector")
-            break
-        except Exception as e:
-            typer.echo(f"Error during connector run: {e}", err=True)
-            time.sleep(interval)
+    _run_connector_forever(c, interval, "Reddit connector")
+
+
+def _load_ciks(ciks: str | None, watchlist: str | None) -> tuple[str, ...]:
+    """CIKs from --ciks, else from the --watchlist JSON file; empty if neither is given."""
+    from tip.connectors.edgar import normalize_cik
+
+    if ciks:
+        return tuple(sys.intern(normalize_cik(c.strip())) for c in ciks.split(",") if c.strip())
+    if not watchlist:
+        return ()
+    from pathlib import Path
+    wl_path = Path(watchlist)
+    if not wl_path.exists():
+        typer.echo(f"Error: Watchlist file not found: {watchlist}", err=True)
+        raise typer.Exit(1)
+    data = orjson.loads(wl_path.read_bytes())
+    if isinstance(data, list):
+        return tuple(sys.intern(normalize_cik(c)) for c in data)
+    if isinstance(data, dict) and "ciks" in data:
+        return tuple(sys.intern(normalize_cik(c)) for c in data["ciks"])
+    typer.echo("Error: Watchlist must be a JSON array or object with 'ciks' key", err=True)
+    raise typer.Exit(1)
+
+
+def _parse_forms(forms: str | None) -> list[str]:
+    from tip.connectors.edgar import DEFAULT_FORMS_ALLOWLIST
+
+    if forms:
+        return [f.strip() for f in forms.split(",") if f.strip()]
+    return DEFAULT_FORMS_ALLOWLIST.copy()
 
 
 @app.command()
@@ -242,6 +336,7 @@ def run_edgar(
     user_agent_name: str = typer.Option("TradingIntelPlatform", help="Name for SEC User-Agent header"),
     user_agent_email: str = typer.Option("contact@example.com", help="Email for SEC User-Agent header"),
     state_db: str = typer.Option("./edgar_state.db", help="Path to SQLite state database"),
+    bulk: bool = typer.Option(False, "--bulk", help="Backfill mode: COPY outbox rows instead of INSERT"),
 ):
     """Run the SEC EDGAR connector in a continuous loop.
     
@@ -252,36 +347,13 @@ def run_edgar(
         tip run-edgar --ciks "320193,789019"  # Apple and Microsoft
         tip run-edgar --watchlist ./ciks.json --interval 300
     """
-    from tip.connectors.edgar import EDGARConnector, EDGARConfig, normalize_cik, DEFAULT_FORMS_ALLOWLIST
-    
-    # Load CIK list
-    cik_list = []
-    if ciks:
-        cik_list = [normalize_cik(c.strip()) for c in ciks.split(",") if c.strip()]
-    elif watchlist:
-        import json as json_module
-        from pathlib import Path
-        wl_path = Path(watchlist)
-        if not wl_path.exists():
-            typer.echo(f"Error: Watchlist file not found: {watchlist}", err=True)
-            raise typer.Exit(1)
-        data = json_module.loads(wl_path.read_text())
-        if isinstance(data, list):
-            cik_list = [normalize_cik(c) for c in data]
-        elif isinstance(data, dict) and "ciks" in data:
-            cik_list = [normalize_cik(c) for c in data["ciks"]]
-        else:
-            typer.echo("Error: Watchlist must be a JSON array or object with 'ciks' key", err=True)
-            raise typer.Exit(1)
+    from tip.connectors.edgar import EDGARConnector, EDGARConfig
     
+    cik_list = _load_ciks(ciks, watchlist)
     if not cik_list:
         typer.echo("Error: No CIKs provided. Use --ciks or --watchlist", err=True)
         raise typer.Exit(1)
-    
-    # Parse forms allowlist
-    forms_list = DEFAULT_FORMS_ALLOWLIST.copy()
-    if forms:
-        forms_list = [f.strip() for f in forms.split(",") if f.strip()]
+    forms_list = _parse_forms(forms)
     
     s = Settings()
     s3 = S3Client(S3Config(bucket=s.S3_BUCKET, region=s.AWS_REGION))
@@ -296,6 +368,7 @@ def run_edgar(
         s3_bucket=s.S3_BUCKET,
         dsn=s.PG_DSN,
         sqs_queue_url=s.SQS_QUEUE_URL,
+        bulk=bulk,
     )
     
     edgar_cfg = EDGARConfig(
@@ -310,24 +383,110 @@ def run_edgar(
     c = EDGARConnector(cfg, s3, bus, edgar_cfg=edgar_cfg)
     
     typer.echo(f"Starting EDGAR connector:")
-    typer.echo(f"  Mode: {mode}")
+    typer.echo(f"  Mode: {mode}{' (bulk)' if bulk else ''}")
     typer.echo(f"  Interval: {interval}s")
     typer.echo(f"  CIKs: {len(cik_list)} companies")
     typer.echo(f"  Max RPS: {edgar_cfg.max_rps}")
     typer.echo(f"  Forms: {', '.join(forms_list[:5])}{'...' if len(forms_list) > 5 else ''}")
     typer.echo(f"  User-Agent: {edgar_cfg.user_agent}")
     
-    while True:
-        try:
-            stats = c.run_once()
-            typer.echo(f"[{datetime.now(timezone.utc).isoformat()}] {json.dumps(stats)}")
-            time.sleep(interval)
-        except KeyboardInterrupt:
-            typer.echo("\nShutting down EDGAR connector")
-            break
-        except Exception as e:
-            typer.echo(f"Error during connector run: {e}", err=True)
-            time.sleep(interval)
+    _run_connector_forever(c, interval, "EDGAR connector")
+
+
+@app.command()
+def run_all(
+    mode: str = typer.Option("shadow", help="shadow or emit"),
+    wsb_interval: int = typer.Option(60, help="Seconds between WSB mock runs (0 disables)"),
+    reddit_interval: int = typer.Option(60, help="Seconds between Reddit runs (0 disables)"),
+    subreddits: str = typer.Option("wallstreetbets", help="Comma-separated subreddits"),
+    edgar_interval: int = typer.Option(180, help="Seconds between EDGAR polling cycles (0 disables)"),
+    ciks: str = typer.Option(None, help="Comma-separated CIKs to poll (EDGAR is skipped without CIKs or a watchlist)"),
+    watchlist: str = typer.Option(None, help="Path to JSON file with the EDGAR CIK list"),
+    max_rps: float = typer.Option(2.0, help="EDGAR max requests per second (capped at 8)"),
+    forms: str = typer.Option(None, help="Comma-separated EDGAR form types to track (default: 8-K,10-Q,10-K,etc)"),
+    user_agent_name: str = typer.Option("TradingIntelPlatform", help="Name for SEC User-Agent header"),
+    user_agent_email: str = typer.Option("contact@example.com", help="Email for SEC User-Agent header"),
+    state_db: str = typer.Option("./edgar_state.db", help="Path to EDGAR SQLite state database"),
+):
+    """Run every connector in one process, each on its own interval.
+    
+    A single asyncio supervisor schedules the connectors and runs their
+    blocking run_once() calls on a thread pool, so I/O waits overlap and
+    all connectors share one S3 client and one SQS bus.
+    
+    Example:
+        tip run-all --subreddits "wallstreetbets,stocks" --ciks "320193,789019"
+    """
+    import asyncio
+    from tip.connectors.reddit import RedditConnector
+    from tip.connectors.edgar import EDGARConnector, EDGARConfig
+
+    s = Settings()
+    s3 = S3Client(S3Config(bucket=s.S3_BUCKET, region=s.AWS_REGION))
+    bus = None
+    if mode == "emit" and s.SQS_QUEUE_URL:
+        bus = SQSBus(SQSConfig(queue_url=s.SQS_QUEUE_URL, dlq_url=s.SQS_DLQ_URL, region=s.AWS_REGION))
+
+    def cfg(name: str, source: str) -> ConnectorConfig:
+        return ConnectorConfig(
+            name=name,
+            mode=mode,
+            source=source,
+            s3_bucket=s.S3_BUCKET,
+            dsn=s.PG_DSN,
+            sqs_queue_url=s.SQS_QUEUE_URL,
+        )
+
+    connectors = []
+    if wsb_interval > 0:
+        connectors.append(("wsb-mock", WSBMockConnector(cfg("wsb-mock", "wsb"), s3, bus), wsb_interval))
+    if reddit_interval > 0:
+        subreddit_list = tuple(sys.intern(name.strip()) for name in subreddits.split(",") if name.strip())
+        connectors.append(
+            ("reddit", RedditConnector(cfg("reddit", "reddit"), s3, bus, subreddits=subreddit_list), reddit_interval)
+        )
+    cik_list = _load_ciks(ciks, watchlist) if edgar_interval > 0 else ()
+    if cik_list:
+        edgar_cfg = EDGARConfig(
+            ciks=cik_list,
+            user_agent_name=user_agent_name,
+            user_agent_email=user_agent_email,
+            max_rps=max_rps,
+            forms_allowlist=_parse_forms(forms),
+            state_db_path=state_db,
+        )
+        connectors.append(("edgar", EDGARConnector(cfg("edgar", "edgar"), s3, bus, edgar_cfg=edgar_cfg), edgar_interval))
+
+    if not connectors:
+        typer.echo("Error: No connectors enabled", err=True)
+        raise typer.Exit(1)
+
+    async def every(name: str, c, interval: int) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += interval
+            try:
+                stats = await loop.run_in_executor(None, c.run_once)
+                _log.info("%s %s", name, orjson.dumps(stats).decode())
+            except Exception as e:
+                typer.echo(f"Error during {name} run: {e}", err=True)
+            # After an overrun, restart the schedule from now rather than bursting
+            # to catch up (as _loop_every does)
+            next_tick = max(next_tick, loop.time())
+            await asyncio.sleep(next_tick - loop.time())
+
+    async def supervisor() -> None:
+        await asyncio.gather(*(every(name, c, interval) for name, c, interval in connectors))
+
+    typer.echo(f"Starting connectors (mode={mode}): {', '.join(f'{n} every {i}s' for n, _, i in connectors)}")
+    try:
+        asyncio.run(supervisor())
+    except KeyboardInterrupt:
+        typer.echo("\nShutting down connectors")
+    finally:
+        for _, c, _ in connectors:
+            c.close()
 
 
 @app.command()
@@ -340,33 +499,13 @@ def lookup_cik(
         tip lookup-cik AAPL
         tip lookup-cik "Apple Inc"
     """
-    import requests
-    
+    from tip.connectors.edgar import fetch_company_tickers, search_company_tickers
+
     typer.echo(f"Searching SEC for: {query}")
     
     try:
-        response = requests.get(
-            "https://www.sec.gov/files/company_tickers.json",
-            headers={"User-Agent": "TradingIntelPlatform contact@example.com (cik-lookup)"},
-            timeout=30,
-        )
-        response.raise_for_status()
-        data = response.json()
-        
-        query_upper = query.upper()
-        matches = []
-        
-        for entry in data.values():
-            ticker = entry.get("ticker", "").upper()
-            title = entry.get("title", "").upper()
-            cik = entry.get("cik_str", "")
-            
-            if query_upper == ticker or query_upper in title:
-                matches.append({
-                    "cik": f"{int(cik):010d}",
-                    "ticker": entry.get("ticker"),
-                    "name": entry.get("title"),
-                })
+        data = fetch_company_tickers("TradingIntelPlatform contact@example.com (cik-lookup)")
+        matches = search_company_tickers(data, query)
         
         if not matches:
             typer.echo("No matches found.")
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, Dict, Any, Optional
+from typing import Iterable, Dict, Any, List, Optional, Tuple
 import hashlib
 import uuid
 
+from psycopg.types.json import Jsonb
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from tip.models import EventV1, EventType, Source, PayloadRefs
 from tip.storage.s3 import S3Client
 from tip.db.session import get_session_sync
@@ -15,6 +21,13 @@ from tip.bus.sqs import SQSBus
 
 logger = logging.getLogger(__name__)
 
+# Events per INSERT ... ON CONFLICT statement; 16 columns x 500 rows stays far below
+# PostgreSQL's 65535 bind-parameter limit
+INSERT_BATCH_SIZE = 500
+
+# Concurrent S3 PUTs per run_once; each PUT is latency-bound, not CPU-bound
+S3_WRITE_WORKERS = 16
+
 
 @dataclass
 class ConnectorConfig:
@@ -24,6 +37,7 @@ class ConnectorConfig:
     s3_bucket: str
     dsn: str
     sqs_queue_url: Optional[str] = None
+    bulk: bool = False  # backfills: COPY outbox rows instead of INSERT
 
 
 class BaseConnector:
@@ -39,81 +53,185 @@ class BaseConnector:
     def normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         raise NotImplementedError
 
+    def close(self) -> None:
+        """Release connector resources (HTTP sessions, state databases) on shutdown."""
+
     def run_once(self) -> Dict[str, Any]:
         stats = {"fetched": 0, "ingested": 0, "deduped": 0, "errors": 0}
         now = datetime.now(timezone.utc)
-        for raw in self.fetch():
-            stats["fetched"] += 1
-            try:
-                normalized = self.normalize(raw)
-                event_id = str(uuid.uuid4())
-                ts_event = normalized.get("tsEvent", now)
-                # Write raw to S3
-                raw_uri = self.s3.write_raw(self.cfg.source, ts_event, event_id, raw)
-
-                # Build event
-                dedupe_key = normalized.get("dedupeKey") or hashlib.sha256(
-                    json_dumps_stable(normalized).encode("utf-8")
-                ).hexdigest()
-                event = EventV1(
-                    eventId=event_id,
-                    schemaVersion="v1",
-                    eventType=normalized["eventType"],
-                    source=self.cfg.source,
-                    symbol=normalized.get("symbol"),
-                    entityId=normalized.get("entityId"),
-                    tsEvent=ts_event,
-                    tsIngested=now,
-                    dedupeKey=dedupe_key,
-                    severity=normalized.get("severity", 50),
-                    confidence=normalized.get("confidence"),
-                    payload=normalized.get("payload", {}),
-                    payloadRefs=PayloadRefs(raw=raw_uri),
-                )
-
-                with self.session_scope() as session:
-                    # Insert event row if not exists by dedupe_key
-                    exists = session.query(Event).filter_by(dedupe_key=event.dedupeKey).one_or_none()
-                    if exists:
-                        stats["deduped"] += 1
-                        continue
-
-                    # Persist event row
-                    ev_row = Event(
-                        event_id=event.eventId,
-                        schema_version=event.schemaVersion,
-                        event_type=event.eventType.value,
-                        source=event.source.value,
-                        symbol=event.symbol,
-                        entity_id=event.entityId,
-                        ts_event=event.tsEvent,
-                        ts_ingested=event.tsIngested,
-                        dedupe_key=event.dedupeKey,
-                        severity=event.severity,
-                        confidence=event.confidence,
-                        payload_json=event.payload,
-                        raw_s3_uri=event.payloadRefs.raw,
-                        normalized_s3_uri=None,
-                        hash=None,
-                        created_at=now,
+        batch: List[Tuple[EventV1, datetime]] = []
+        # Raw payloads of the current batch, grouped by event hour; each group becomes
+        # one NDJSON object instead of one PUT per event
+        raw_lines: Dict[datetime, List[Dict[str, Any]]] = {}
+        batch_id = uuid.uuid4().hex
+        event_writes: List[Future] = []
+        # S3 writes run on a pool so ingest isn't serialized behind PUT latency; leaving
+        # the block waits for every outstanding write before stats are reported
+        with ThreadPoolExecutor(max_workers=S3_WRITE_WORKERS, thread_name_prefix="s3-write") as s3_pool:
+            for raw in self.fetch():
+                stats["fetched"] += 1
+                try:
+                    normalized = self.normalize(raw)
+                    # Every connector sets dedupeKey; a KeyError flags one that doesn't
+                    dedupe_key = normalized["dedupeKey"]
+                    event_id = event_id_for(dedupe_key)
+                    ts_event = normalized.get("tsEvent", now)
+                    # Raw goes to line N of this batch's object for the event's hour
+                    hour = ts_event.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+                    lines = raw_lines.setdefault(hour, [])
+                    raw_uri = f"{self.s3.raw_batch_uri(self.cfg.source, hour, batch_id)}#line={len(lines)}"
+
+                    # Build event
+                    event = EventV1(
+                        eventId=event_id,
+                        schemaVersion="v1",
+                        eventType=normalized["eventType"],
+                        source=self.cfg.source,
+                        symbol=normalized.get("symbol"),
+                        entityId=normalized.get("entityId"),
+                        tsEvent=ts_event,
+                        tsIngested=now,
+                        dedupeKey=dedupe_key,
+                        severity=normalized.get("severity", 50),
+                        confidence=normalized.get("confidence"),
+                        payload=normalized.get("payload", {}),
+                        payloadRefs=PayloadRefs(raw=raw_uri),
                     )
-                    session.add(ev_row)
-
-                    if self.cfg.mode == "emit" and self.bus:
-                        session.add(Outbox(event_id=event.eventId, payload=event.model_dump(mode="json")))
-
-                stats["ingested"] += 1
-                # Write canonical event to S3 after commit for lineage
-                self.s3.write_event(event.eventType.value, ts_event, event_id, event.model_dump(mode="json"))
-
-                # Publish only via an outbox dispatcher elsewhere
-            except Exception:
-                logger.exception("Error processing event")
+                    lines.append(raw)
+                    batch.append((event, hour))
+                except Exception:
+                    logger.exception("Error processing event")
+                    stats["errors"] += 1
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    event_writes.extend(self._flush_batch(batch, raw_lines, batch_id, now, stats, s3_pool))
+                    batch, raw_lines, batch_id = [], {}, uuid.uuid4().hex
+            if batch:
+                event_writes.extend(self._flush_batch(batch, raw_lines, batch_id, now, stats, s3_pool))
+        for write in event_writes:
+            if write.exception() is not None:
+                logger.error("Error writing canonical event to S3", exc_info=write.exception())
                 stats["errors"] += 1
         return stats
 
+    def _flush_batch(
+        self,
+        batch: List[Tuple[EventV1, datetime]],
+        raw_lines: Dict[datetime, List[Dict[str, Any]]],
+        batch_id: str,
+        now: datetime,
+        stats: Dict[str, Any],
+        s3_pool: ThreadPoolExecutor,
+    ) -> List[Future]:
+        raw_writes = {
+            hour: s3_pool.submit(self.s3.write_batch, self.cfg.source, hour, batch_id, lines)
+            for hour, lines in raw_lines.items()
+            if lines
+        }
+        failed_hours = set()
+        for hour, raw_write in raw_writes.items():
+            try:
+                raw_write.result()
+            except Exception:
+                logger.exception(f"Error writing raw batch for {hour:%Y-%m-%dT%H} to S3")
+                failed_hours.add(hour)
+        # Persist only events whose raw payload landed, so raw_s3_uri never dangles
+        events: List[EventV1] = []
+        for event, hour in batch:
+            if hour in failed_hours:
+                stats["errors"] += 1
+                continue
+            events.append(event)
+        if not events:
+            return []
+        new_events = self._persist_batch(events, now, stats)
+        # Write canonical events to S3 after commit for lineage
+        # Publish only via an outbox dispatcher elsewhere
+        return [
+            s3_pool.submit(self.s3.write_event, event.eventType.value, event.tsEvent, str(event.eventId), event_json)
+            for event, event_json in new_events
+        ]
+
+    def _persist_batch(
+        self, events: List[EventV1], now: datetime, stats: Dict[str, Any]
+    ) -> List[Tuple[EventV1, Dict[str, Any]]]:
+        """Insert a batch of events (and outbox rows) in one transaction.
+
+        Dedupe happens in the INSERT itself: ON CONFLICT (dedupe_key) DO NOTHING
+        RETURNING event_id yields only the rows that were actually new. Those are
+        returned with their JSON-mode dump, for the caller's S3 writes.
+        """
+        event_rows = [
+            {
+                "event_id": event.eventId,
+                "schema_version": event.schemaVersion,
+                "event_type": event.eventType.value,
+                "source": event.source.value,
+                "symbol": event.symbol,
+                "entity_id": event.entityId,
+                "ts_event": event.tsEvent,
+                "ts_ingested": event.tsIngested,
+                "dedupe_key": event.dedupeKey,
+                "severity": event.severity,
+                "confidence": event.confidence,
+                "payload_json": event.payload,
+                "raw_s3_uri": event.payloadRefs.raw,
+                "normalized_s3_uri": None,
+                "hash": None,
+                "created_at": now,
+            }
+            for event in events
+        ]
+        try:
+            with self.session_scope() as session:
+                inserted = set(
+                    session.execute(
+                        pg_insert(Event)
+                        .values(event_rows)
+                        .on_conflict_do_nothing(index_elements=["dedupe_key"])
+                        .returning(Event.event_id)
+                    ).scalars()
+                )
+                # Same dedupe key => same event_id, so take each inserted id only once.
+                # Dump each new event once; the outbox row and the S3 copy share it.
+                new_events = []
+                for event in events:
+                    if event.eventId in inserted:
+                        inserted.discard(event.eventId)
+                        new_events.append((event, event.model_dump(mode="json")))
+                if self.cfg.mode == "emit" and self.bus and new_events:
+                    if self.cfg.bulk:
+                        _copy_outbox(session, [(event.eventId, event_json) for event, event_json in new_events])
+                    else:
+                        session.execute(
+                            insert(Outbox),
+                            [{"event_id": event.eventId, "payload": event_json} for event, event_json in new_events],
+                        )
+        except Exception:
+            logger.exception(f"Error persisting batch of {len(events)} events")
+            stats["errors"] += len(events)
+            return []
+
+        stats["ingested"] += len(new_events)
+        stats["deduped"] += len(events) - len(new_events)
+        return new_events
+
+
+def _copy_outbox(session, rows: List[Tuple[Any, Dict[str, Any]]]) -> None:
+    # Binary COPY skips per-row statement execution entirely. It runs on the session's
+    # own psycopg connection so it commits (or rolls back) together with the events.
+    conn = session.connection().connection.driver_connection
+    with conn.cursor() as cur, cur.copy("COPY outbox (event_id, payload) FROM STDIN (FORMAT BINARY)") as copy:
+        copy.set_types(["uuid", "jsonb"])
+        for event_id, payload in rows:
+            copy.write_row((event_id, Jsonb(payload)))
+
+
+def event_id_for(dedupe_key: str) -> str:
+    """Derive a stable UUID (v4-shaped, as EventV1 requires) from a dedupe key.
+
+    Re-ingesting the same item yields the same event_id (and canonical S3 key), so
+    retries converge on the same row and object.
+    """
+    digest = hashlib.blake2b(dedupe_key.encode("utf-8"), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
 
-def json_dumps_stable(obj: Dict[str, Any]) -> str:
-    import json
-
-    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
@@ -13,16 +13,25 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import os
 import random
 import time
 import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from email.utils import formatdate
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, Dict, Any, List, Optional, Tuple
+from typing import Iterable, Dict, Any, List, Optional, Sequence, Tuple
 import logging
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from tip.connectors.base import BaseConnector, ConnectorConfig
 from tip.models import EventType
@@ -33,6 +42,21 @@ logger = logging.getLogger(__name__)
 SEC_ABSOLUTE_MAX_RPS = 8
 DEFAULT_RPS = 2.0
 
+COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+DEFAULT_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "tip"
+
+# Shared keep-alive session for one-off www.sec.gov lookups (the connector itself keeps
+# its own session with per-instance headers)
+_sec_session = requests.Session()
+_sec_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+    ),
+)
+
 # Default forms to track
 DEFAULT_FORMS_ALLOWLIST = [
     "8-K", "10-Q", "10-K", "S-1",
@@ -44,10 +68,12 @@ DEFAULT_FORMS_ALLOWLIST = [
 
 @dataclass
 class RateLimiter:
-    """Token bucket rate limiter for SEC requests."""
+    """Token bucket rate limiter for SEC requests, shared by all polling threads."""
     max_rps: float = DEFAULT_RPS
     tokens: float = field(init=False)
     last_refill: float = field(init=False)
+    paused_until: float = field(init=False, default=0.0)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
     
     def __post_init__(self):
         # Hard cap - NEVER exceed SEC safety limit
@@ -60,23 +86,34 @@ class RateLimiter:
     def acquire(self) -> None:
         """Acquire a token, blocking if necessary."""
         while True:
-            now = time.time()
-            elapsed = now - self.last_refill
-            self.tokens = min(self.max_rps, self.tokens + elapsed * self.max_rps)
-            self.last_refill = now
-            
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return
-            
-            wait_time = (1 - self.tokens) / self.max_rps
+            with self._lock:
+                now = time.time()
+                if now < self.paused_until:
+                    wait_time = self.paused_until - now
+                else:
+                    elapsed = now - self.last_refill
+                    self.tokens = min(self.max_rps, self.tokens + elapsed * self.max_rps)
+                    self.last_refill = now
+                    
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    
+                    # Up to 10% jitter so waiters woken together don't retry in lockstep
+                    wait_time = (1 - self.tokens) / self.max_rps * random.uniform(1.0, 1.1)
+            # Sleep outside the lock so other threads aren't serialized behind us
             time.sleep(wait_time)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller of acquire() for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.time() + seconds)
 
 
 @dataclass
 class EDGARConfig:
     """EDGAR-specific configuration."""
-    ciks: List[str]  # List of 10-digit zero-padded CIKs
+    ciks: Sequence[str]  # 10-digit zero-padded CIKs
     user_agent_name: str = "TradingIntelPlatform"
     user_agent_email: str = "contact@example.com"
     max_rps: float = DEFAULT_RPS
@@ -106,13 +143,15 @@ class EDGARConnector(BaseConnector):
         super().__init__(cfg, s3, bus)
         self.edgar_cfg = edgar_cfg or EDGARConfig(ciks=[])
         self.rate_limiter = RateLimiter(max_rps=self.edgar_cfg.max_rps)
-        self.forms_allowlist = set(f.upper() for f in self.edgar_cfg.forms_allowlist)
+        self.forms_allowlist = frozenset(sys.intern(f.upper()) for f in self.edgar_cfg.forms_allowlist)
         
         # Initialize state database for deduplication
         self._init_state_db()
         
         # Session for HTTP requests
         self.session = requests.Session()
+        # Sized for the parallel CIK pollers in fetch()
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
         self.session.headers.update({
             "User-Agent": self.edgar_cfg.user_agent,
             "Accept": "application/json",
@@ -121,15 +160,23 @@ class EDGARConnector(BaseConnector):
         
         # Consecutive error tracking for cooldown
         self._consecutive_errors = 0
+        self._errors_lock = threading.Lock()
         self._in_cooldown = False
     
     def _init_state_db(self) -> None:
-        """Initialize SQLite database for state tracking."""
+        """Open the SQLite state database, kept open for the connector's lifetime."""
         db_path = Path(self.edgar_cfg.state_db_path)
         db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        conn = sqlite3.connect(str(db_path))
-        conn.executescript("""
+        # Autocommit mode; WAL + synchronous=NORMAL avoids an fsync per tiny write
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        # Polling threads share the connection; serialize access to it
+        self._db_lock = threading.RLock()
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
             CREATE TABLE IF NOT EXISTS seen_filings (
                 cik TEXT NOT NULL,
                 accession TEXT NOT NULL,
@@ -143,58 +190,60 @@ class EDGARConnector(BaseConnector):
                 last_poll_at TEXT
             );
         """)
-        conn.commit()
-        conn.close()
         logger.info(f"EDGAR state DB initialized: {db_path}")
     
-    def _is_seen(self, cik: str, accession: str) -> bool:
-        """Check if we've already processed this filing."""
-        conn = sqlite3.connect(self.edgar_cfg.state_db_path)
-        cursor = conn.execute(
-            "SELECT 1 FROM seen_filings WHERE cik = ? AND accession = ?",
-            (cik, accession)
-        )
-        result = cursor.fetchone() is not None
-        conn.close()
-        return result
+    def _load_seen(self, ciks: Sequence[str]) -> Dict[str, set]:
+        """Load already-processed accessions for ``ciks`` in a few queries."""
+        seen: Dict[str, set] = {cik: set() for cik in ciks}
+        # Stay well under SQLite's bound-variable limit
+        for start in range(0, len(ciks), 500):
+            chunk = ciks[start:start + 500]
+            with self._db_lock:
+                rows = self._db.execute(
+                    f"SELECT cik, accession FROM seen_filings WHERE cik IN ({','.join('?' * len(chunk))})",
+                    tuple(chunk)
+                ).fetchall()
+            for cik, accession in rows:
+                seen[cik].add(accession)
+        return seen
     
-    def _mark_seen(self, cik: str, accession: str) -> None:
-        """Mark a filing as seen."""
-        conn = sqlite3.connect(self.edgar_cfg.state_db_path)
-        conn.execute(
-            "INSERT OR IGNORE INTO seen_filings (cik, accession, first_seen_at) VALUES (?, ?, ?)",
-            (cik, accession, datetime.now(timezone.utc).isoformat())
-        )
-        conn.commit()
-        conn.close()
+    def _mark_seen(self, cik: str, accessions: List[str]) -> None:
+        """Mark filings as seen."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO seen_filings (cik, accession, first_seen_at) VALUES (?, ?, ?)",
+                [(cik, accession, now) for accession in accessions]
+            )
     
     def _get_cik_state(self, cik: str) -> Tuple[Optional[str], Optional[str]]:
         """Get cached ETag and Last-Modified for a CIK."""
-        conn = sqlite3.connect(self.edgar_cfg.state_db_path)
-        cursor = conn.execute(
-            "SELECT last_etag, last_modified FROM cik_state WHERE cik = ?",
-            (cik,)
-        )
-        row = cursor.fetchone()
-        conn.close()
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT last_etag, last_modified FROM cik_state WHERE cik = ?",
+                (cik,)
+            ).fetchone()
         return (row[0], row[1]) if row else (None, None)
     
     def _update_cik_state(self, cik: str, etag: Optional[str], last_modified: Optional[str]) -> None:
         """Update cached state for a CIK."""
-        conn = sqlite3.connect(self.edgar_cfg.state_db_path)
-        conn.execute(
-            """
-            INSERT INTO cik_state (cik, last_etag, last_modified, last_poll_at)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(cik) DO UPDATE SET
-                last_etag = COALESCE(excluded.last_etag, last_etag),
-                last_modified = COALESCE(excluded.last_modified, last_modified),
-                last_poll_at = excluded.last_poll_at
-            """,
-            (cik, etag, last_modified, datetime.now(timezone.utc).isoformat())
-        )
-        conn.commit()
-        conn.close()
+        with self._db_lock:
+            self._db.execute(
+                """
+                INSERT INTO cik_state (cik, last_etag, last_modified, last_poll_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(cik) DO UPDATE SET
+                    last_etag = COALESCE(excluded.last_etag, last_etag),
+                    last_modified = COALESCE(excluded.last_modified, last_modified),
+                    last_poll_at = excluded.last_poll_at
+                """,
+                (cik, etag, last_modified, datetime.now(timezone.utc).isoformat())
+            )
+    
+    def close(self) -> None:
+        """Close the HTTP session and the state database."""
+        self.session.close()
+        self._db.close()
     
     def _fetch_cik(self, cik: str) -> Tuple[Optional[Dict], bool]:
         """
@@ -224,7 +273,7 @@ class EDGARConnector(BaseConnector):
             if response.status_code == 304:
                 logger.debug(f"CIK {cik} not modified (304)")
                 self._update_cik_state(cik, etag, last_modified)
-                self._consecutive_errors = 0
+                self._reset_errors()
                 return None, False
             
             # Rate limited or forbidden
@@ -243,7 +292,7 @@ class EDGARConnector(BaseConnector):
             new_etag = response.headers.get("ETag")
             new_last_modified = response.headers.get("Last-Modified")
             self._update_cik_state(cik, new_etag, new_last_modified)
-            self._consecutive_errors = 0
+            self._reset_errors()
             
             return response.json(), True
             
@@ -251,26 +300,42 @@ class EDGARConnector(BaseConnector):
             logger.error(f"Request error for CIK {cik}: {e}")
             return None, False
     
+    def _reset_errors(self) -> None:
+        with self._errors_lock:
+            self._consecutive_errors = 0
+    
     def _handle_rate_limit(self, response: requests.Response) -> None:
-        """Handle SEC rate limiting."""
-        self._consecutive_errors += 1
+        """Handle SEC rate limiting.
+        
+        The back-off is applied through the shared rate limiter, so every polling
+        thread waits, not just the one that received the 429/403.
+        """
+        with self._errors_lock:
+            self._consecutive_errors += 1
+            consecutive_errors = self._consecutive_errors
+            if consecutive_errors >= 3:
+                self._consecutive_errors = 0
         
         retry_after = response.headers.get("Retry-After")
         wait_time = int(retry_after) if retry_after else 60
         
         logger.warning(
             f"Rate limited by SEC (status={response.status_code}), "
-            f"waiting {wait_time}s, consecutive_errors={self._consecutive_errors}"
+            f"waiting {wait_time}s, consecutive_errors={consecutive_errors}"
         )
         
         # Enter cooldown after repeated errors
-        if self._consecutive_errors >= 3:
+        if consecutive_errors >= 3:
             cooldown = 10 * 60 * random.uniform(0.8, 1.2)  # 8-12 minutes
             logger.critical(f"ENTERING COOLDOWN MODE for {cooldown/60:.1f} minutes")
-            time.sleep(cooldown)
-            self._consecutive_errors = 0
+            self.rate_limiter.pause(cooldown)
         else:
-            time.sleep(wait_time)
+            self.rate_limiter.pause(wait_time)
+    
+    def _poll_cik(self, cik: str) -> Tuple[Optional[Dict], bool]:
+        # Add jitter between CIKs
+        time.sleep(random.uniform(0.1, 0.5))
+        return self._fetch_cik(cik)
     
     def fetch(self) -> Iterable[Dict[str, Any]]:
         """Fetch new filings from all CIKs in the watchlist."""
@@ -280,11 +345,39 @@ class EDGARConnector(BaseConnector):
         
         logger.info(f"Polling {len(self.edgar_cfg.ciks)} CIKs for new filings")
         
-        for cik in self.edgar_cfg.ciks:
-            # Add jitter between CIKs
-            time.sleep(random.uniform(0.1, 0.5))
-            
-            data, was_modified = self._fetch_cik(cik)
+        # One bulk read up front; membership checks below are plain set lookups
+        seen = self._load_seen(self.edgar_cfg.ciks)
+        
+        # Requests overlap on a small pool while the shared token bucket keeps the
+        # aggregate rate at max_rps; responses are parsed here as they complete
+        workers = max(1, min(8, int(self.edgar_cfg.max_rps * 2)))
+        
+        # All state writes of a poll share one transaction: one fsync per cycle
+        # instead of one per CIK/filing
+        with self._db_lock:
+            self._db.execute("BEGIN IMMEDIATE")
+        try:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="edgar")
+            try:
+                futures = {pool.submit(self._poll_cik, cik): cik for cik in self.edgar_cfg.ciks}
+                yield from self._parse_completed(futures, seen)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        except Exception:
+            with self._db_lock:
+                self._db.rollback()
+            raise
+        finally:
+            # Also reached when the consumer stops iterating early; what was marked
+            # so far has been yielded, so keep it
+            with self._db_lock:
+                if self._db.in_transaction:
+                    self._db.commit()
+    
+    def _parse_completed(self, futures: Dict[Any, str], seen: Dict[str, set]) -> Iterable[Dict[str, Any]]:
+        for future in as_completed(futures):
+            cik = futures[future]
+            data, was_modified = future.result()
             
             if not was_modified or data is None:
                 continue
@@ -300,23 +393,23 @@ class EDGARConnector(BaseConnector):
             primary_docs = recent.get("primaryDocument", [])
             
             cik_no_padding = str(int(cik))
+            company_name = data.get("name", "")
+            tickers = data.get("tickers", [])
+            cik_seen = seen[cik]
+            newly_seen: List[str] = []
             
-            for i in range(min(100, len(accessions))):
-                form = forms[i] if i < len(forms) else ""
-                
+            # SEC returns these as parallel, equal-length arrays, newest first
+            for accession, form, filing_date, primary_doc in islice(
+                zip(accessions, forms, filing_dates, primary_docs), 100
+            ):
                 # Filter by forms allowlist
                 if form.upper() not in self.forms_allowlist:
                     continue
                 
-                accession = accessions[i]
-                
                 # Skip already seen
-                if self._is_seen(cik, accession):
+                if accession in cik_seen:
                     continue
                 
-                filing_date = filing_dates[i] if i < len(filing_dates) else ""
-                primary_doc = primary_docs[i] if i < len(primary_docs) else ""
-                
                 # Build filing index URL
                 accession_no_dashes = accession.replace("-", "")
                 filing_url = (
@@ -324,8 +417,8 @@ class EDGARConnector(BaseConnector):
                     f"{accession_no_dashes}/{accession}-index.html"
                 )
                 
-                # Mark as seen before yielding
-                self._mark_seen(cik, accession)
+                cik_seen.add(accession)
+                newly_seen.append(accession)
                 
                 yield {
                     "cik": cik,
@@ -334,9 +427,13 @@ class EDGARConnector(BaseConnector):
                     "filingDate": filing_date,
                     "filingIndexUrl": filing_url,
                     "primaryDocument": primary_doc,
-                    "companyName": data.get("name", ""),
-                    "tickers": data.get("tickers", []),
+                    "companyName": company_name,
+                    "tickers": tickers,
                 }
+            
+            # One executemany per CIK instead of a write per filing
+            if newly_seen:
+                self._mark_seen(cik, newly_seen)
     
     def normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize a filing into a TIP event."""
@@ -391,3 +488,55 @@ def normalize_cik(cik: str) -> str:
     """Normalize CIK to 10-digit zero-padded format."""
     return f"{int(cik):010d}"
 
+
+def fetch_company_tickers(user_agent: str, cache_dir: Path = DEFAULT_CACHE_DIR) -> Dict[str, Any]:
+    """
+    Fetch SEC's company_tickers.json (~3MB), keeping a local copy revalidated by ETag.
+
+    The cached body lives at ``cache_dir/company_tickers.json`` with its ETag in a
+    ``.etag`` sidecar; an unchanged file costs one 304 round trip and no body transfer.
+    """
+    body_path = cache_dir / "company_tickers.json"
+    etag_path = cache_dir / "company_tickers.json.etag"
+    headers = {"User-Agent": user_agent}
+    if body_path.exists():
+        if etag_path.exists():
+            headers["If-None-Match"] = etag_path.read_text().strip()
+        headers["If-Modified-Since"] = formatdate(body_path.stat().st_mtime, usegmt=True)
+
+    response = _sec_session.get(COMPANY_TICKERS_URL, headers=headers, timeout=30)
+    if response.status_code == 304:
+        logger.debug("company_tickers.json not modified (304), using cache")
+        return orjson.loads(body_path.read_bytes())
+    response.raise_for_status()
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = body_path.with_suffix(".tmp")
+    tmp_path.write_bytes(response.content)
+    tmp_path.replace(body_path)
+    etag = response.headers.get("ETag")
+    if etag:
+        etag_path.write_text(etag)
+    else:
+        etag_path.unlink(missing_ok=True)
+    return orjson.loads(response.content)
+
+
+def search_company_tickers(data: Dict[str, Any], query: str) -> List[Dict[str, str]]:
+    """Match ``query`` against tickers (exact) and company names (substring), tickers first."""
+    query_upper = query.upper()
+    ticker_matches: List[Dict[str, str]] = []
+    name_matches: List[Dict[str, str]] = []
+    for entry in data.values():
+        if query_upper == entry.get("ticker", "").upper():
+            bucket = ticker_matches
+        elif query_upper in entry.get("title", "").upper():
+            bucket = name_matches
+        else:
+            continue
+        bucket.append({
+            "cik": f"{int(entry.get('cik_str', 0)):010d}",
+            "ticker": entry.get("ticker"),
+            "name": entry.get("title"),
+        })
+    return ticker_matches + name_matches
@@ -3,21 +3,30 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Iterable, Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Dict, Any, List, Optional, Sequence
 from datetime import datetime, timezone
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from tip.connectors.base import BaseConnector, ConnectorConfig
 from tip.models import EventType
 
 logger = logging.getLogger(__name__)
 
-# Common stock ticker pattern
-TICKER_PATTERN = re.compile(r'\$([A-Z]{1,5})\b|\b([A-Z]{2,5})\b')
+# Common stock ticker pattern: an uppercase word of 1-5 letters, optionally $-prefixed.
+# Single letters only count with the $ (checked in _extract_tickers).
+TICKER_PATTERN = re.compile(r'(\$)?\b([A-Z]{1,5})\b')
+
+MAX_TICKERS_PER_POST = 5
+
+# Upper bound on concurrent subreddit requests per poll
+MAX_FETCH_WORKERS = 8
 
 # Filter out common words that look like tickers
-TICKER_BLACKLIST = {
+TICKER_BLACKLIST = frozenset({
     "THE", "AND", "FOR", "ARE", "BUT", "NOT", "YOU", "ALL", "CAN", "HAD",
     "HER", "WAS", "ONE", "OUR", "OUT", "HAS", "HIS", "HOW", "MAN", "NEW",
     "NOW", "OLD", "SEE", "WAY", "WHO", "BOY", "DID", "GET", "HIM", "LET",
@@ -25,60 +34,70 @@ TICKER_BLACKLIST = {
     "CIA", "GDP", "IMO", "TBH", "LOL", "WTF", "OMG", "FYI", "EOD", "ATH",
     "ATL", "DD", "YOLO", "FOMO", "HODL", "WSB", "GME", "AMC", "APE", "APES",
     "MOON", "HOLD", "BUY", "SELL", "CALL", "PUT", "ITM", "OTM", "IV", "DTE",
-}
+})
 
 
 class RedditConnector(BaseConnector):
     """Connector for Reddit finance subreddits (r/wallstreetbets, r/stocks, etc.)."""
     
-    def __init__(self, cfg: ConnectorConfig, s3, bus=None, subreddits: Optional[List[str]] = None):
+    def __init__(self, cfg: ConnectorConfig, s3, bus=None, subreddits: Optional[Sequence[str]] = None):
         super().__init__(cfg, s3, bus)
-        self.subreddits = subreddits or ["wallstreetbets"]
+        self.subreddits = tuple(subreddits or ("wallstreetbets",))
         self.user_agent = "TradingIntelPlatform/1.0"
+        # One keep-alive pool for every poll instead of a fresh TLS handshake per request
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=MAX_FETCH_WORKERS,
+                max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+            ),
+        )
+        self.session.headers["User-Agent"] = self.user_agent
         self.seen_ids: set = set()  # In-memory dedup for current run
     
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self.session.close()
+    
     def fetch(self) -> Iterable[Dict[str, Any]]:
         """Fetch new posts from configured subreddits."""
-        for subreddit in self.subreddits:
+        # Subreddits are independent, so request them concurrently: a poll costs
+        # roughly the slowest response instead of the sum of all of them
+        workers = min(MAX_FETCH_WORKERS, len(self.subreddits))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reddit") as pool:
+            futures = [(sub, pool.submit(self._fetch_subreddit, sub, 25)) for sub in self.subreddits]
+        
+        for subreddit, future in futures:
             try:
-                posts = self._fetch_subreddit(subreddit, limit=25)
-                for post in posts:
-                    # Skip already seen in this run
-                    if post["id"] in self.seen_ids:
-                        continue
-                    self.seen_ids.add(post["id"])
-                    yield post
+                posts = future.result()
             except Exception as e:
                 logger.error(f"Error fetching r/{subreddit}: {e}")
+                continue
+            for post in posts:
+                # Skip already seen in this run
+                if post["id"] in self.seen_ids:
+                    continue
+                self.seen_ids.add(post["id"])
+                yield post
     
     def _fetch_subreddit(self, subreddit: str, limit: int = 25) -> List[Dict[str, Any]]:
         """Fetch posts from a subreddit using Reddit's JSON API."""
         url = f"https://www.reddit.com/r/{subreddit}/new.json"
-        headers = {"User-Agent": self.user_agent}
         params = {"limit": limit, "raw_json": 1}
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = self.session.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
+        # Pass Reddit's post dicts through as-is; normalize() reads the API's own keys.
+        # subreddit is pinned to the configured name so dedupe keys stay stable.
         posts = []
-        
         for child in data.get("data", {}).get("children", []):
             post = child.get("data", {})
-            posts.append({
-                "id": post.get("id"),
-                "subreddit": subreddit,
-                "title": post.get("title", ""),
-                "selftext": post.get("selftext", ""),
-                "author": post.get("author"),
-                "score": post.get("score", 0),
-                "upvote_ratio": post.get("upvote_ratio", 0),
-                "num_comments": post.get("num_comments", 0),
-                "created_utc": post.get("created_utc"),
-                "permalink": post.get("permalink"),
-                "url": post.get("url"),
-                "link_flair_text": post.get("link_flair_text"),
-            })
+            post["subreddit"] = subreddit
+            posts.append(post)
         
         logger.info(f"Fetched {len(posts)} posts from r/{subreddit}")
         return posts
@@ -126,16 +145,11 @@ class RedditConnector(BaseConnector):
     
     def _extract_tickers(self, text: str) -> List[str]:
         """Extract potential stock tickers from text."""
-        matches = TICKER_PATTERN.findall(text)
-        tickers = []
-        
-        for match in matches:
-            # match is a tuple from alternation groups
-            ticker = match[0] or match[1]
-            if ticker and ticker.upper() not in TICKER_BLACKLIST:
-                ticker_upper = ticker.upper()
-                if ticker_upper not in tickers:
-                    tickers.append(ticker_upper)
-        
-        return tickers[:5]  # Limit to 5 tickers per post
-
+        tickers: List[str] = []
+        for match in TICKER_PATTERN.finditer(text):
+            dollar, ticker = match.groups()
+            if (dollar or len(ticker) > 1) and ticker not in TICKER_BLACKLIST and ticker not in tickers:
+                tickers.append(ticker)
+                if len(tickers) == MAX_TICKERS_PER_POST:
+                    break
+        return tickers
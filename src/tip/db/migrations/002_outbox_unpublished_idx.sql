@@ -0,0 +1,7 @@
+-- Partial index for the outbox dispatcher poll:
+--   SELECT ... WHERE published_at IS NULL ORDER BY outbox_id LIMIT n FOR UPDATE SKIP LOCKED
+-- Only pending rows are indexed, so it stays small and the poll stays O(batch_size)
+-- however large the published history grows.
+-- Migrations run inside a single transaction, so this cannot use CONCURRENTLY; on a
+-- large live table, create it CONCURRENTLY by hand first and this becomes a no-op.
+CREATE INDEX IF NOT EXISTS outbox_unpublished_idx ON outbox (outbox_id) WHERE published_at IS NULL;
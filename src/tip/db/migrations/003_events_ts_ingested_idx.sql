@@ -0,0 +1,7 @@
+-- Range index for replay_by_ts_ingested (what `tip replay-last-minutes` runs):
+--   SELECT payload_json FROM events WHERE ts_ingested BETWEEN $1 AND $2 ORDER BY ts_ingested
+-- Without it every replay is a sequential scan plus sort of the whole table.
+-- payload_json is deliberately not INCLUDEd: b-tree entries are capped at ~2.7kB, so
+-- a covering index would make inserts of larger payloads fail.
+-- As with 002, build it CONCURRENTLY by hand first on a large live table.
+CREATE INDEX IF NOT EXISTS ix_events_ts_ingested ON events (ts_ingested);
@@ -0,0 +1,7 @@
+-- GIN index for ad-hoc containment queries on event payloads, e.g.
+--   SELECT ... FROM events WHERE payload_json @> '{"subreddit": "wallstreetbets"}'
+-- jsonb_path_ops only serves @> (and jsonpath) lookups but is a fraction of the size
+-- of the default jsonb_ops and cheaper to maintain on insert.
+-- The JSON columns are already JSONB (001_init.sql), so no type conversion is needed.
+-- As with 002, build it CONCURRENTLY by hand first on a large live table.
+CREATE INDEX IF NOT EXISTS ix_events_payload_gin ON events USING gin (payload_json jsonb_path_ops);
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Integer, BigInteger, JSON, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import String, DateTime, Integer, BigInteger, ForeignKey, UniqueConstraint, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 import uuid
 
 
@@ -19,11 +20,11 @@ class Event(Base):
     symbol: Mapped[str | None] = mapped_column(String(16))
     entity_id: Mapped[str | None] = mapped_column(String(64))
     ts_event: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
-    ts_ingested: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    ts_ingested: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
     dedupe_key: Mapped[str] = mapped_column(String(255), unique=True)
     severity: Mapped[int] = mapped_column(Integer)
     confidence: Mapped[float | None]
-    payload_json: Mapped[dict] = mapped_column(JSON)
+    payload_json: Mapped[dict] = mapped_column(JSONB)
     raw_s3_uri: Mapped[str | None] = mapped_column(String(512))
     normalized_s3_uri: Mapped[str | None] = mapped_column(String(512))
     hash: Mapped[str | None] = mapped_column(String(64))
@@ -33,6 +34,12 @@ class Event(Base):
 
     __table_args__ = (
         Index("ix_events_symbol", "symbol"),
+        Index(
+            "ix_events_payload_gin",
+            "payload_json",
+            postgresql_using="gin",
+            postgresql_ops={"payload_json": "jsonb_path_ops"},
+        ),
     )
 
 
@@ -42,7 +49,7 @@ class EventArtifact(Base):
     event_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("events.event_id"))
     artifact_type: Mapped[str] = mapped_column(String(64))
     model_name: Mapped[str | None] = mapped_column(String(64))
-    artifact_json: Mapped[dict] = mapped_column(JSON)
+    artifact_json: Mapped[dict] = mapped_column(JSONB)
     artifact_s3_uri: Mapped[str | None] = mapped_column(String(512))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
@@ -53,15 +60,19 @@ class Outbox(Base):
     __tablename__ = "outbox"
     outbox_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     event_id: Mapped[uuid.UUID]
-    payload: Mapped[dict] = mapped_column(JSON)
+    payload: Mapped[dict] = mapped_column(JSONB)
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
+    __table_args__ = (
+        Index("outbox_unpublished_idx", "outbox_id", postgresql_where=text("published_at IS NULL")),
+    )
+
 
 class CanaryRun(Base):
     __tablename__ = "canary_runs"
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     service: Mapped[str] = mapped_column(String(64))
     version: Mapped[str] = mapped_column(String(32))
-    stats_json: Mapped[dict] = mapped_column(JSON)
+    stats_json: Mapped[dict] = mapped_column(JSONB)
     status: Mapped[str] = mapped_column(String(16))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
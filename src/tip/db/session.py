@@ -1,17 +1,49 @@
 from __future__ import annotations
 
+import threading
 from contextlib import contextmanager
+from typing import Dict
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
+# One engine (and connection pool) and one sessionmaker per DSN for the whole process;
+# callers such as dispatch_once and replay ask for a session scope on every call
+_ENGINES: Dict[str, Engine] = {}
+_SESSIONMAKERS: Dict[str, sessionmaker] = {}
+_lock = threading.Lock()
 
-def get_engine_sync(dsn: str):
-    return create_engine(dsn, pool_pre_ping=True, future=True)
 
+def get_engine_sync(dsn: str) -> Engine:
+    with _lock:
+        engine = _ENGINES.get(dsn)
+        if engine is None:
+            # insertmanyvalues_page_size pinned explicitly: rows per INSERT emitted for the
+            # executemany batches (outbox, enrichment), so statement size is predictable
+            engine = _ENGINES[dsn] = create_engine(
+                dsn,
+                pool_pre_ping=True,
+                pool_size=20,
+                max_overflow=40,
+                insertmanyvalues_page_size=1000,
+                future=True,
+            )
+    return engine
 
-def get_session_sync(dsn: str):
+
+def _get_sessionmaker(dsn: str) -> sessionmaker:
     engine = get_engine_sync(dsn)
-    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True)
+    with _lock:
+        Session = _SESSIONMAKERS.get(dsn)
+        if Session is None:
+            Session = _SESSIONMAKERS[dsn] = sessionmaker(
+                bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True
+            )
+    return Session
+
+
+def get_session_sync(dsn: str):
+    Session = _get_sessionmaker(dsn)
 
     @contextmanager
     def session_scope():
@@ -1,16 +1,40 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+import atexit
 import hashlib
+import logging
+import threading
+import time
 import uuid
 
+import orjson
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from tip.models import EventV1, EventType, Source, PayloadRefs
 from tip.storage.s3 import S3Client
 from tip.db.session import get_session_sync
 from tip.db.models import Event, EventArtifact, Outbox
 
+logger = logging.getLogger(__name__)
+
+# Insights per executemany INSERT in run_on_events
+INSERT_BATCH_SIZE = 500
+
+# An hour's insight archive object is written to S3 once it holds this many
+# (uncompressed) bytes or its oldest insight has waited this long
+ARCHIVE_FLUSH_BYTES = 256 * 1024
+ARCHIVE_FLUSH_SECONDS = 5.0
+# A failed archive PUT is retried after ARCHIVE_FLUSH_SECONDS, doubling up to this cap
+ARCHIVE_RETRY_MAX_SECONDS = 300.0
+# Most insight bytes held for S3 (e.g. through an outage); past it the oldest buckets
+# are dropped, and their rows keep a NULL normalized_s3_uri
+ARCHIVE_MAX_PENDING_BYTES = 64 * 1024 * 1024
+
 
 @dataclass
 class EnrichmentConfig:
@@ -21,6 +45,165 @@ class EnrichmentConfig:
     model_name: str
     per_day_usd_cap: float = 5.0
     per_event_token_limit: int = 2000
+    content_cache_size: int = 100_000
+
+
+class _SeenHashes:
+    """Bounded set of 64-bit content fingerprints; evicts the least recently seen when full."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, None] = OrderedDict()
+
+    def __contains__(self, content_hash: int) -> bool:
+        if content_hash in self._entries:
+            self._entries.move_to_end(content_hash)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, content_hash: int) -> None:
+        self._entries[content_hash] = None
+        self._entries.move_to_end(content_hash)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class _ArchiveBuffer:
+    """Pending NDJSON lines for one (event type, hour) archive object."""
+
+    def __init__(self):
+        self.event_ids: List[uuid.UUID] = []
+        self.lines: List[bytes] = []
+        self.size = 0
+        self.opened = time.monotonic()
+        self.attempts = 0
+        self.retry_at = 0.0
+
+
+class _InsightArchive:
+    """Aggregates insight events into one S3 object per (event type, hour) batch.
+
+    ``append()`` only buffers. A background thread writes each bucket once it holds
+    ``max_bytes`` or has been open for ``max_age`` seconds; ``close()`` (registered
+    at exit) writes the rest. Only after a PUT succeeds is ``on_written(uri,
+    event_ids)`` called, so a URI is never recorded for an object that doesn't
+    exist. A failed PUT puts the bucket back with an exponential backoff; at most
+    ``max_pending_bytes`` are held, dropping the oldest buckets beyond that.
+    """
+
+    def __init__(
+        self,
+        s3: S3Client,
+        on_written: Callable[[str, List[uuid.UUID]], None],
+        max_bytes: int = ARCHIVE_FLUSH_BYTES,
+        max_age: float = ARCHIVE_FLUSH_SECONDS,
+        max_pending_bytes: int = ARCHIVE_MAX_PENDING_BYTES,
+    ):
+        self.s3 = s3
+        self.on_written = on_written
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_pending_bytes = max_pending_bytes
+        self._buffers: Dict[Tuple[str, datetime], _ArchiveBuffer] = {}
+        self._pending = 0
+        # Guards the buffers only; PUTs and the DB update run outside it, on buckets
+        # already taken out of ``_buffers``
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._timer = threading.Thread(target=self._run, name="insight-archive", daemon=True)
+        self._timer.start()
+
+    def append(self, event_type: str, hour: datetime, events: List[Tuple[uuid.UUID, bytes]]) -> None:
+        with self._lock:
+            buf = self._buffers.get((event_type, hour))
+            if buf is None:
+                buf = self._buffers[(event_type, hour)] = _ArchiveBuffer()
+            for event_id, line in events:
+                buf.event_ids.append(event_id)
+                buf.lines.append(line)
+                buf.size += len(line)
+                self._pending += len(line)
+            full = buf.size >= self.max_bytes
+            self._enforce_cap()
+        if full:
+            self._wake.set()
+
+    def flush_due(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                self._take(key)
+                for key, buf in list(self._buffers.items())
+                if buf.retry_at <= now and (buf.size >= self.max_bytes or now - buf.opened >= self.max_age)
+            ]
+        for key, buf in due:
+            self._write(key, buf)
+
+    def flush(self) -> None:
+        with self._lock:
+            due = [self._take(key) for key in list(self._buffers)]
+        for key, buf in due:
+            self._write(key, buf)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._timer.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.max_age / 4)
+            self._wake.clear()
+            self.flush_due()
+
+    def _take(self, key: Tuple[str, datetime]) -> Tuple[Tuple[str, datetime], _ArchiveBuffer]:
+        buf = self._buffers.pop(key)
+        self._pending -= buf.size
+        return key, buf
+
+    def _restore(self, key: Tuple[str, datetime], buf: _ArchiveBuffer) -> None:
+        # Lines appended while the PUT was in flight go after the failed ones
+        newer = self._buffers.get(key)
+        if newer is not None:
+            buf.event_ids.extend(newer.event_ids)
+            buf.lines.extend(newer.lines)
+            buf.size += newer.size
+            self._pending -= newer.size
+        self._buffers[key] = buf
+        self._pending += buf.size
+        self._enforce_cap()
+
+    def _enforce_cap(self) -> None:
+        while self._pending > self.max_pending_bytes and self._buffers:
+            key = min(self._buffers, key=lambda k: self._buffers[k].opened)
+            _, buf = self._take(key)
+            event_type, hour = key
+            logger.error(
+                f"Insight archive over {self.max_pending_bytes} pending bytes; dropped {len(buf.lines)} "
+                f"{event_type} insights for {hour:%Y-%m-%dT%H} (their normalized_s3_uri stays NULL)"
+            )
+
+    def _write(self, key: Tuple[str, datetime], buf: _ArchiveBuffer) -> None:
+        event_type, hour = key
+        try:
+            uri = self.s3.write_event_batched(event_type, hour, uuid.uuid4().hex, buf.lines)
+        except Exception:
+            delay = min(self.max_age * 2**buf.attempts, ARCHIVE_RETRY_MAX_SECONDS)
+            buf.attempts += 1
+            buf.retry_at = time.monotonic() + delay
+            logger.exception(f"Error archiving {len(buf.lines)} {event_type} insights to S3; retrying in {delay:.0f}s")
+            with self._lock:
+                self._restore(key, buf)
+            return
+        try:
+            self.on_written(uri, buf.event_ids)
+        except Exception:
+            logger.exception(f"Error recording archive URI {uri}")
 
 
 class BaseEnrichment:
@@ -28,26 +211,84 @@ class BaseEnrichment:
         self.cfg = cfg
         self.s3 = s3
         self.session_scope = get_session_sync(cfg.dsn)
-        self._content_cache: set[str] = set()
+        # Bounded so long-running enrichers don't grow without limit
+        self._content_cache = _SeenHashes(cfg.content_cache_size)
+        self._archive = _InsightArchive(s3, self._record_archive_uri)
+        atexit.register(self._archive.close)
 
     def annotate(self, event: EventV1) -> Dict[str, Any]:
         raise NotImplementedError
 
-    def should_skip_cost(self, content_hash: str) -> bool:
-        return content_hash in self._content_cache
+    def should_skip_cost(self, content_key: int) -> bool:
+        return content_key in self._content_cache
+
+    def flush(self) -> None:
+        """Write insights still buffered for S3 now instead of waiting for the archive thread."""
+        self._archive.flush()
+
+    def _record_archive_uri(self, uri: str, event_ids: List[uuid.UUID]) -> None:
+        with self.session_scope() as session:
+            session.execute(update(Event).where(Event.event_id.in_(event_ids)).values(normalized_s3_uri=uri))
 
     def run_on_event(self, event: EventV1) -> Optional[EventV1]:
+        insights = self.run_on_events([event])
+        return insights[0] if insights else None
+
+    def run_on_events(self, events: Iterable[EventV1]) -> List[EventV1]:
+        """Enrich events, persisting insights in batches of ``INSERT_BATCH_SIZE``.
+
+        Returns the insight events created. Events whose content was already
+        enriched, or whose insight dedupe key already exists, are skipped. Each
+        insight's S3 archive copy is buffered per hour, and its ``normalized_s3_uri``
+        is set once the batch object holding it is written.
+
+        If ``annotate()`` raises, the insights already built in the current batch
+        are persisted before the exception propagates.
+        """
+        insights: List[EventV1] = []
+        batch: List[Tuple[EventV1, EventV1]] = []
+        # Content keys of the current batch; they join the cache only once the batch
+        # commits, so a failed batch is enriched again on retry
+        pending: set[int] = set()
+        try:
+            for event in events:
+                insight_event = self._build_insight(event, pending)
+                if insight_event is None:
+                    continue
+                batch.append((event, insight_event))
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    full, batch = batch, []
+                    insights.extend(self._persist_insights(full))
+                    self._cache_content(pending)
+        finally:
+            # Annotations are paid for; keep them even when a later event fails
+            if batch:
+                insights.extend(self._persist_insights(batch))
+                self._cache_content(pending)
+        return insights
+
+    def _cache_content(self, pending: set[int]) -> None:
+        for content_key in pending:
+            self._content_cache.add(content_key)
+        pending.clear()
+
+    def _build_insight(self, event: EventV1, pending: set[int]) -> Optional[EventV1]:
         content = event.payload
-        content_hash = hashlib.sha256(json_dumps_stable(content).encode("utf-8")).hexdigest()
-        if self.should_skip_cost(content_hash):
+        # Fingerprint only, not a security boundary: BLAKE2b is faster than SHA-256
+        digest = hashlib.blake2b(json_dumps_stable(content), digest_size=16).digest()
+        # The cache keeps only a 64-bit prefix as an int: ~8x smaller than the hex
+        # string, and collisions are negligible at cache sizes (~3e-10 at 100k)
+        content_key = int.from_bytes(digest[:8], "big")
+        if self.should_skip_cost(content_key) or content_key in pending:
             return None
 
         insight = self.annotate(event)
-        self._content_cache.add(content_hash)
+        pending.add(content_key)
+        content_hash = digest.hex()
 
         now = datetime.now(timezone.utc)
         event_id = str(uuid.uuid4())
-        insight_event = EventV1(
+        return EventV1(
             eventId=event_id,
             schemaVersion="v1",
             eventType=EventType.MODEL_INSIGHT,
@@ -63,45 +304,89 @@ class BaseEnrichment:
             payloadRefs=PayloadRefs(),
         )
 
+    def _persist_insights(self, batch: List[Tuple[EventV1, EventV1]]) -> List[EventV1]:
+        """Insert a batch of insights (artifacts, events, outbox) in one transaction.
+
+        ON CONFLICT (dedupe_key) DO NOTHING RETURNING event_id skips insights that
+        already exist (e.g. re-enriched after a restart) without failing the batch;
+        artifact and outbox rows are written only for the insights actually inserted.
+        """
+        event_rows = [
+            {
+                "event_id": insight_event.eventId,
+                "schema_version": insight_event.schemaVersion,
+                "event_type": insight_event.eventType.value,
+                "source": insight_event.source.value,
+                "symbol": insight_event.symbol,
+                "entity_id": insight_event.entityId,
+                "ts_event": insight_event.tsEvent,
+                "ts_ingested": insight_event.tsIngested,
+                "dedupe_key": insight_event.dedupeKey,
+                "severity": insight_event.severity,
+                "confidence": insight_event.confidence,
+                "payload_json": insight_event.payload,
+                "raw_s3_uri": None,
+                # Filled in with the batch object's URI once it is written to S3
+                "normalized_s3_uri": None,
+                "hash": None,
+                "created_at": insight_event.tsIngested,
+            }
+            for _, insight_event in batch
+        ]
         with self.session_scope() as session:
-            session.add(
-                EventArtifact(
-                    event_id=event.eventId,
-                    artifact_type="MODEL.SUMMARY",
-                    model_name=self.cfg.model_name,
-                    artifact_json=insight,
-                    artifact_s3_uri=None,
-                    created_at=now,
-                )
+            inserted = set(
+                session.execute(
+                    pg_insert(Event)
+                    .values(event_rows)
+                    .on_conflict_do_nothing(index_elements=["dedupe_key"])
+                    .returning(Event.event_id)
+                ).scalars()
             )
-            session.add(
-                Event(
-                    event_id=insight_event.eventId,
-                    schema_version=insight_event.schemaVersion,
-                    event_type=insight_event.eventType.value,
-                    source=insight_event.source.value,
-                    symbol=insight_event.symbol,
-                    entity_id=insight_event.entityId,
-                    ts_event=insight_event.tsEvent,
-                    ts_ingested=insight_event.tsIngested,
-                    dedupe_key=insight_event.dedupeKey,
-                    severity=insight_event.severity,
-                    confidence=insight_event.confidence,
-                    payload_json=insight_event.payload,
-                    raw_s3_uri=None,
-                    normalized_s3_uri=None,
-                    hash=None,
-                    created_at=now,
-                )
+            batch = [(event, insight_event) for event, insight_event in batch if insight_event.eventId in inserted]
+            insights = [insight_event for _, insight_event in batch]
+            if not insights:
+                return []
+            session.execute(
+                insert(EventArtifact),
+                [
+                    {
+                        "event_id": event.eventId,
+                        "artifact_type": "MODEL.SUMMARY",
+                        "model_name": self.cfg.model_name,
+                        "artifact_json": insight_event.payload,
+                        "artifact_s3_uri": None,
+                        "created_at": insight_event.tsIngested,
+                    }
+                    for event, insight_event in batch
+                ],
             )
+            # Serialized once, straight to JSON bytes by pydantic-core (no dict pass)
+            # for S3; the outbox, in emit mode, gets a dict parsed back by orjson
+            dumped = [insight_event.model_dump_json().encode() for insight_event in insights]
             if self.cfg.mode == "emit":
-                session.add(Outbox(event_id=insight_event.eventId, payload=insight_event.model_dump(mode="json")))
+                session.execute(
+                    insert(Outbox),
+                    [
+                        {"event_id": insight_event.eventId, "payload": orjson.loads(payload)}
+                        for insight_event, payload in zip(insights, dumped)
+                    ],
+                )
+
+        # Appended only after the rows commit, so no archive object holds an insight
+        # Postgres doesn't know about
+        groups: Dict[Tuple[str, datetime], List[Tuple[uuid.UUID, bytes]]] = {}
+        for insight_event, payload in zip(insights, dumped):
+            key = (insight_event.eventType.value, _hour(insight_event.tsEvent))
+            groups.setdefault(key, []).append((insight_event.eventId, payload))
+        for (event_type, hour), lines in groups.items():
+            self._archive.append(event_type, hour, lines)
+        return insights
 
-        self.s3.write_event(insight_event.eventType.value, now, insight_event.eventId, insight_event.model_dump(mode="json"))
-        return insight_event
 
+def _hour(ts: datetime) -> datetime:
+    return ts.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
 
-def json_dumps_stable(obj: Dict[str, Any]) -> str:
-    import json
 
-    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+def json_dumps_stable(obj: Dict[str, Any]) -> bytes:
+    # Compact, key-sorted UTF-8 bytes, ready to hash without a separate encode()
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
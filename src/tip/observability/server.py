@@ -1,12 +1,60 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import gzip
+import threading
+import time
+
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+# Scrapes within this window share one generate_latest() walk (and its gzip)
+CACHE_TTL_SECONDS = 1.0
+
+_cache = {"ts": float("-inf"), "body": b"", "gzip": b""}
+_cache_lock = threading.Lock()
+
+
+def _exposition() -> tuple[bytes, bytes]:
+    with _cache_lock:
+        now = time.monotonic()
+        if now - _cache["ts"] >= CACHE_TTL_SECONDS:
+            body = generate_latest()
+            _cache.update(ts=now, body=body, gzip=gzip.compress(body))
+        return _cache["body"], _cache["gzip"]
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values (``gzip;q=0`` refuses it)."""
+    wildcard = False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "gzip":
+            return q > 0
+        wildcard = q > 0
+    return wildcard
+
 
-app = FastAPI()
+def metrics(request: Request) -> Response:
+    # Plain Starlette route: no FastAPI dependency resolution or response validation
+    # per scrape, just the exposition body
+    body, compressed = _exposition()
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return Response(compressed, media_type=CONTENT_TYPE_LATEST, headers={"Content-Encoding": "gzip"})
+    return Response(body, media_type=CONTENT_TYPE_LATEST)
 
 
-@app.get("/metrics")
-def metrics():
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+app = Starlette(routes=[Route("/metrics", metrics)])
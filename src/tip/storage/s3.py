@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import gzip
-import io
-import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
 import os
 import boto3
+import orjson
 
 
 @dataclass
@@ -22,21 +22,33 @@ class S3Client:
         self.cfg = cfg
         endpoint = cfg.endpoint_url or os.getenv("AWS_ENDPOINT_URL")
         self.s3 = boto3.client("s3", region_name=cfg.region, endpoint_url=endpoint)
+        self._endpoint = endpoint
+        self._arrow_fs = None
 
     def _put_gzip_json(self, key: str, obj: Dict[str, Any]) -> str:
-        buf = io.BytesIO()
-        with gzip.GzipFile(fileobj=buf, mode="wb") as gz:
-            gz.write(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
-        buf.seek(0)
         self.s3.put_object(
             Bucket=self.cfg.bucket,
             Key=key,
-            Body=buf.read(),
+            Body=gzip.compress(orjson.dumps(obj)),
             ContentType="application/json",
             ContentEncoding="gzip",
         )
         return f"s3://{self.cfg.bucket}/{key}"
 
+    def open_output_stream(self, key: str, content_type: str = "application/octet-stream"):
+        """Open a pyarrow output stream that multipart-uploads to ``key`` as it is written."""
+        if self._arrow_fs is None:
+            from pyarrow import fs
+
+            kwargs: Dict[str, Any] = {"region": self.cfg.region}
+            if self._endpoint:
+                url = urlparse(self._endpoint)
+                kwargs.update(endpoint_override=url.netloc, scheme=url.scheme)
+            self._arrow_fs = fs.S3FileSystem(**kwargs)
+        return self._arrow_fs.open_output_stream(
+            f"{self.cfg.bucket}/{key}", metadata={"Content-Type": content_type}
+        )
+
     @staticmethod
     def _ymd(ts: datetime) -> Dict[str, str]:
         ts = ts.astimezone(timezone.utc)
@@ -47,12 +59,52 @@ class S3Client:
         key = f"raw/{source}/yyyy={ymd['yyyy']}/mm={ymd['mm']}/dd={ymd['dd']}/{event_id}.json.gz"
         return self._put_gzip_json(key, payload)
 
-    def write_event(self, event_type: str, ts_event: datetime, event_id: str, event_obj: Dict[str, Any]) -> str:
+    def _raw_batch_key(self, source: str, hour: datetime, batch_id: str) -> str:
+        ymd = self._ymd(hour)
+        hh = f"{hour.astimezone(timezone.utc).hour:02d}"
+        return f"raw/{source}/yyyy={ymd['yyyy']}/mm={ymd['mm']}/dd={ymd['dd']}/hh={hh}/{batch_id}.ndjson.gz"
+
+    def raw_batch_uri(self, source: str, hour: datetime, batch_id: str) -> str:
+        """URI that ``write_batch`` will return for the same arguments, without writing."""
+        return f"s3://{self.cfg.bucket}/{self._raw_batch_key(source, hour, batch_id)}"
+
+    def write_batch(self, source: str, hour: datetime, batch_id: str, items: List[Dict[str, Any]]) -> str:
+        """Write many raw payloads as one gzipped NDJSON object (one item per line)."""
+        key = self._raw_batch_key(source, hour, batch_id)
+        self.s3.put_object(
+            Bucket=self.cfg.bucket,
+            Key=key,
+            Body=gzip.compress(b"".join(orjson.dumps(item) + b"\n" for item in items)),
+            ContentType="application/x-ndjson",
+            ContentEncoding="gzip",
+        )
+        return f"s3://{self.cfg.bucket}/{key}"
+
+    def _event_key(self, event_type: str, ts_event: datetime, event_id: str) -> str:
         ymd = self._ymd(ts_event)
-        key = (
-            f"events/eventType={event_type}/yyyy={ymd['yyyy']}/mm={ymd['mm']}/dd={ymd['dd']}/{event_id}.json.gz"
+        return f"events/eventType={event_type}/yyyy={ymd['yyyy']}/mm={ymd['mm']}/dd={ymd['dd']}/{event_id}.json.gz"
+
+    def write_event(self, event_type: str, ts_event: datetime, event_id: str, event_obj: Dict[str, Any]) -> str:
+        return self._put_gzip_json(self._event_key(event_type, ts_event, event_id), event_obj)
+
+    def _event_batch_key(self, event_type: str, hour: datetime, batch_id: str) -> str:
+        ymd = self._ymd(hour)
+        hh = f"{hour.astimezone(timezone.utc).hour:02d}"
+        return (
+            f"events/eventType={event_type}/yyyy={ymd['yyyy']}/mm={ymd['mm']}/dd={ymd['dd']}/hh={hh}/{batch_id}.ndjson.gz"
+        )
+
+    def write_event_batched(self, event_type: str, hour: datetime, batch_id: str, events: List[bytes]) -> str:
+        """Write many already-serialized events as one gzipped NDJSON object (one event per line)."""
+        key = self._event_batch_key(event_type, hour, batch_id)
+        self.s3.put_object(
+            Bucket=self.cfg.bucket,
+            Key=key,
+            Body=gzip.compress(b"".join(event + b"\n" for event in events)),
+            ContentType="application/x-ndjson",
+            ContentEncoding="gzip",
         )
-        return self._put_gzip_json(key, event_obj)
+        return f"s3://{self.cfg.bucket}/{key}"
 
     def write_enriched(
         self, model_name: str, event_type: str, ts_event: datetime, event_id: str, payload: Dict[str, Any]
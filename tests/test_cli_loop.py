@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import tip.cli
+from tip.cli import _loop_every
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def install_clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(tip.cli, "time", clock)
+    return clock
+
+
+def test_loop_deducts_work_time_from_sleep(monkeypatch):
+    clock = install_clock(monkeypatch)
+    starts: list[float] = []
+
+    def work() -> None:
+        starts.append(clock.now)
+        clock.now += 3
+
+    assert _loop_every(work, 10, max_cycles=3) == 3
+    assert clock.sleeps == [7, 7]
+    assert starts == [100, 110, 120]
+
+
+def test_loop_reruns_immediately_when_fn_returns_true(monkeypatch):
+    clock = install_clock(monkeypatch)
+    results = iter([True, True, False, False])
+
+    def work() -> bool:
+        clock.now += 1
+        return next(results)
+
+    assert _loop_every(work, 10, max_cycles=4) == 4
+    # No sleep after the backlogged cycles, then a full period from the restart
+    assert clock.sleeps == [9]
+
+
+def test_loop_restarts_schedule_when_work_overruns(monkeypatch):
+    clock = install_clock(monkeypatch)
+    durations = iter([25, 1, 1])
+
+    def work() -> None:
+        clock.now += next(durations)
+
+    _loop_every(work, 10, max_cycles=3)
+    assert clock.sleeps == [9]
+
+
+def test_loop_stops_after_max_cycles(monkeypatch):
+    install_clock(monkeypatch)
+    calls: list[int] = []
+    assert _loop_every(lambda: calls.append(1), 0, max_cycles=5) == 5
+    assert len(calls) == 5
+
+
+instances: list["InterruptedConnector"] = []
+
+
+class InterruptedConnector:
+    def __init__(self, *args, **kwargs):
+        self.closed = False
+        instances.append(self)
+
+    def run_once(self):
+        raise KeyboardInterrupt
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_run_connector_forever_closes_connector_on_shutdown():
+    c = InterruptedConnector()
+    tip.cli._run_connector_forever(c, 60, "test")
+    assert c.closed
+
+
+def test_run_all_closes_connectors_on_shutdown(monkeypatch):
+    from typer.testing import CliRunner
+
+    monkeypatch.setenv("PG_DSN", "sqlite://")
+    monkeypatch.setattr(tip.cli, "WSBMockConnector", InterruptedConnector)
+    instances.clear()
+    result = CliRunner().invoke(
+        tip.cli.app, ["run-all", "--wsb-interval", "60", "--reddit-interval", "0", "--edgar-interval", "0"]
+    )
+    assert "Shutting down connectors" in result.output
+    assert [c.closed for c in instances] == [True]
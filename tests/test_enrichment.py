@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from tip.enrichment.base import _InsightArchive
+
+HOUR = datetime(2026, 10, 15, 13, tzinfo=timezone.utc)
+
+
+class FakeS3:
+    def __init__(self, fail: int = 0, block: threading.Event | None = None):
+        self.writes: list[tuple[str, datetime, list[bytes]]] = []
+        self.attempts = 0
+        self.fail = fail
+        self.block = block
+        self.entered = threading.Event()
+
+    def write_event_batched(self, event_type: str, hour: datetime, batch_id: str, events: list[bytes]) -> str:
+        self.attempts += 1
+        self.entered.set()
+        if self.block is not None:
+            self.block.wait(5)
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("PUT failed")
+        self.writes.append((event_type, hour, list(events)))
+        return f"s3://bucket/{event_type}/{batch_id}.ndjson.gz"
+
+
+def make_archive(s3: FakeS3, **kwargs) -> tuple[_InsightArchive, list[tuple[str, list[uuid.UUID]]]]:
+    written: list[tuple[str, list[uuid.UUID]]] = []
+    archive = _InsightArchive(s3, lambda uri, ids: written.append((uri, ids)), **kwargs)
+    return archive, written
+
+
+def events(n: int, size: int = 10) -> list[tuple[uuid.UUID, bytes]]:
+    return [(uuid.uuid4(), b"x" * size) for _ in range(n)]
+
+
+def wait_until(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_archive_writes_bucket_once_it_reaches_max_bytes():
+    s3 = FakeS3()
+    archive, written = make_archive(s3, max_bytes=100, max_age=60)
+    archive.append("MODEL.INSIGHT", HOUR, events(5))
+    archive.flush_due()
+    assert s3.writes == []
+    batch = events(5)
+    archive.append("MODEL.INSIGHT", HOUR, batch)
+    assert wait_until(lambda: written)
+    assert len(s3.writes) == 1 and len(s3.writes[0][2]) == 10
+    assert written[0][1][-5:] == [event_id for event_id, _ in batch]
+    archive.close()
+
+
+def test_archive_timer_writes_bucket_after_max_age():
+    s3 = FakeS3()
+    archive, written = make_archive(s3, max_bytes=1 << 20, max_age=0.05)
+    archive.append("MODEL.INSIGHT", HOUR, events(3))
+    assert wait_until(lambda: written)
+    assert len(s3.writes) == 1
+    archive.close()
+
+
+def test_archive_append_does_not_wait_for_an_in_flight_put():
+    release = threading.Event()
+    s3 = FakeS3(block=release)
+    archive, written = make_archive(s3, max_bytes=10, max_age=60)
+    archive.append("MODEL.INSIGHT", HOUR, events(1))
+    assert s3.entered.wait(5)
+    # The PUT is blocked; appends (including to the same hour) still return at once
+    archive.append("MODEL.INSIGHT", HOUR, events(1, size=5))
+    archive.append("MODEL.INSIGHT", HOUR.replace(hour=14), events(1, size=5))
+    release.set()
+    archive.close()
+    assert sorted(len(w[2]) for w in s3.writes) == [1, 1, 1]
+
+
+def test_archive_backs_off_after_a_failed_put():
+    s3 = FakeS3(fail=1)
+    archive, written = make_archive(s3, max_bytes=1 << 20, max_age=60)
+    batch = events(2)
+    archive.append("MODEL.INSIGHT", HOUR, batch)
+    archive.flush()
+    assert s3.attempts == 1 and written == []
+    # Still due by size/age, but inside its retry delay: no new attempt
+    archive.max_bytes = 1
+    archive.flush_due()
+    assert s3.attempts == 1
+    archive.close()
+    assert s3.writes == [("MODEL.INSIGHT", HOUR, [line for _, line in batch])]
+    assert written[0][1] == [event_id for event_id, _ in batch]
+
+
+def test_archive_drops_oldest_bucket_past_max_pending_bytes():
+    s3 = FakeS3()
+    archive, _ = make_archive(s3, max_bytes=1 << 20, max_age=60, max_pending_bytes=25)
+    archive.append("MODEL.INSIGHT", HOUR, events(2))
+    archive.append("MODEL.INSIGHT", HOUR.replace(hour=14), events(1))
+    archive.close()
+    assert [(w[1].hour, len(w[2])) for w in s3.writes] == [(14, 1)]
+
+
+def test_archive_groups_by_event_type_and_hour():
+    s3 = FakeS3()
+    archive, _ = make_archive(s3, max_bytes=1 << 20, max_age=60)
+    archive.append("MODEL.INSIGHT", HOUR, events(1))
+    archive.append("MODEL.INSIGHT", HOUR.replace(hour=14), events(1))
+    archive.append("MODEL.INSIGHT", HOUR, events(1))
+    archive.close()
+    assert sorted((w[1].hour, len(w[2])) for w in s3.writes) == [(13, 2), (14, 1)]
+
+
+def test_write_event_batched_writes_gzipped_ndjson():
+    from tip.storage.s3 import S3Client, S3Config
+
+    class FakeBoto:
+        def put_object(self, **kwargs):
+            self.kwargs = kwargs
+
+    client = S3Client.__new__(S3Client)
+    client.cfg = S3Config(bucket="bucket")
+    client.s3 = FakeBoto()
+    uri = client.write_event_batched("MODEL.INSIGHT", HOUR, "b1", [b'{"a":1}', b'{"a":2}'])
+    assert uri == "s3://bucket/events/eventType=MODEL.INSIGHT/yyyy=2026/mm=10/dd=15/hh=13/b1.ndjson.gz"
+    assert gzip.decompress(client.s3.kwargs["Body"]) == b'{"a":1}\n{"a":2}\n'
+
+
+def make_enrichment(persist):
+    from tip.enrichment.base import BaseEnrichment, EnrichmentConfig
+
+    class Echo(BaseEnrichment):
+        annotated = 0
+
+        def annotate(self, event):
+            self.annotated += 1
+            return {"confidence": 0.5}
+
+        def _persist_insights(self, batch):
+            return persist(batch)
+
+    cfg = EnrichmentConfig(
+        name="echo", mode="shadow", dsn="postgresql+psycopg://tip@localhost/tip", s3_bucket="b", model_name="m"
+    )
+    enrichment = Echo(cfg, FakeS3())
+    enrichment._archive.close()
+    return enrichment
+
+
+def social_event(payload: dict):
+    from tip.models import EventV1, EventType, Source
+
+    now = datetime.now(timezone.utc)
+    return EventV1(
+        eventId=str(uuid.uuid4()),
+        schemaVersion="v1",
+        eventType=EventType.SOCIAL_MENTIONS,
+        source=Source.WSB,
+        symbol="OPEN",
+        entityId=None,
+        tsEvent=now,
+        tsIngested=now,
+        dedupeKey=str(uuid.uuid4()),
+        severity=50,
+        confidence=None,
+        payload=payload,
+    )
+
+
+def test_content_is_cached_only_after_the_batch_persists():
+    def fail(batch):
+        raise RuntimeError("db down")
+
+    enrichment = make_enrichment(fail)
+    with pytest.raises(RuntimeError):
+        enrichment.run_on_events([social_event({"k": 1}), social_event({"k": 1})])
+    # The duplicate within the batch was skipped, but nothing was cached
+    assert enrichment.annotated == 1
+    assert len(enrichment._content_cache) == 0
+
+    enrichment = make_enrichment(lambda batch: [insight for _, insight in batch])
+    assert len(enrichment.run_on_events([social_event({"k": 1})])) == 1
+    assert enrichment.run_on_events([social_event({"k": 1})]) == []
+    assert enrichment.annotated == 1
+
+
+def test_seen_hashes_evicts_least_recently_seen():
+    from tip.enrichment.base import _SeenHashes
+
+    seen = _SeenHashes(maxsize=2)
+    seen.add(1)
+    seen.add(2)
+    assert 1 in seen  # refreshes 1, so 2 is now the oldest
+    seen.add(3)
+    assert len(seen) == 2
+    assert 2 not in seen
+    assert 1 in seen and 3 in seen
+
+
+def test_insights_built_before_an_annotate_failure_are_persisted():
+    persisted: list = []
+
+    def persist(batch):
+        persisted.extend(insight for _, insight in batch)
+        return [insight for _, insight in batch]
+
+    enrichment = make_enrichment(persist)
+    annotate = enrichment.annotate
+
+    def flaky(event):
+        if event.payload.get("fail"):
+            raise TimeoutError("LLM timed out")
+        return annotate(event)
+
+    enrichment.annotate = flaky
+    with pytest.raises(TimeoutError):
+        enrichment.run_on_events([social_event({"k": 1}), social_event({"k": 2}), social_event({"fail": True})])
+    assert len(persisted) == 2
+    # Cached, so a retry of the same events doesn't pay for them again
+    assert len(enrichment._content_cache) == 2
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from tip.analytics.indexes import CHUNK_ROWS, build_daily_parquet_index
+from tip.storage.s3 import S3Client, S3Config
+
+TS = "2026-10-15T13:00:00+00:00"
+
+
+class FakeBoto:
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = objects
+
+    def copy_object(self, Bucket: str, Key: str, CopySource: dict) -> None:
+        self.objects[Key] = self.objects[CopySource["Key"]]
+
+    def delete_object(self, Bucket: str, Key: str) -> None:
+        self.objects.pop(Key, None)
+
+
+class FakeS3(S3Client):
+    """In-memory stand-in: output streams land in ``objects`` when closed."""
+
+    def __init__(self):
+        self.cfg = S3Config(bucket="bucket")
+        self.objects: dict[str, bytes] = {}
+        self.s3 = FakeBoto(self.objects)
+
+    def open_output_stream(self, key: str, content_type: str = "application/octet-stream"):
+        objects = self.objects
+
+        class Sink(pa.BufferOutputStream):
+            def close(self):
+                if not self.closed:
+                    objects[key] = self.getvalue().to_pybytes()
+
+        return Sink()
+
+
+def event(i: int) -> dict:
+    return {"eventId": f"e{i}", "eventType": "SOCIAL.MENTIONS", "source": "wsb", "tsEvent": TS, "tsIngested": TS}
+
+
+def test_index_is_copied_to_its_key_on_success():
+    s3 = FakeS3()
+    uri = build_daily_parquet_index(s3, "SOCIAL.MENTIONS", [event(i) for i in range(10)], datetime.now(timezone.utc))
+    [(key, body)] = s3.objects.items()
+    assert uri == f"s3://bucket/{key}" and key.endswith("part-000.parquet")
+    assert pq.read_table(pa.BufferReader(body)).num_rows == 10
+
+
+def test_failed_build_leaves_no_object_behind():
+    s3 = FakeS3()
+    events = [event(i) for i in range(CHUNK_ROWS + 1)]
+    del events[-1]["eventType"]
+    with pytest.raises(KeyError):
+        build_daily_parquet_index(s3, "SOCIAL.MENTIONS", events, datetime.now(timezone.utc))
+    assert s3.objects == {}
+
+
+def test_parquet_writer_allocates_from_the_index_pool(monkeypatch):
+    from tip.analytics import indexes
+
+    pools = []
+    real_writer = pq.ParquetWriter
+
+    def writer(*args, **kwargs):
+        pools.append(kwargs.get("memory_pool"))
+        return real_writer(*args, **kwargs)
+
+    monkeypatch.setattr(indexes.pq, "ParquetWriter", writer)
+    build_daily_parquet_index(FakeS3(), "SOCIAL.MENTIONS", [event(0)], datetime.now(timezone.utc))
+    assert pools == [indexes._POOL]
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+
+from tip.observability.server import _accepts_gzip
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("", False),
+        ("gzip", True),
+        ("deflate, gzip;q=0.5", True),
+        ("GZIP", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, deflate", False),
+        ("br", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("gzip;q=0, *", False),
+        ("gzip;q=oops", False),
+    ],
+)
+def test_accepts_gzip(header, expected):
+    assert _accepts_gzip(header) is expected
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import sqlite3
+
+from psycopg.adapt import Transformer
+from psycopg._queries import PostgresQuery
+from sqlalchemy import create_engine
+
+from tip.cli import _apply_migrations
+
+
+class PsycopgLikeCursor(sqlite3.Cursor):
+    """Scans for placeholders whenever a params object is passed, as psycopg does."""
+
+    def execute(self, sql, params=None):
+        if params is not None:
+            PostgresQuery(Transformer()).convert(sql, {})
+            return super().execute(sql, params)
+        return super().execute(sql)
+
+
+class PsycopgLikeConnection(sqlite3.Connection):
+    def cursor(self, factory=PsycopgLikeCursor):
+        return super().cursor(factory)
+
+
+def test_migrations_with_a_literal_percent_run_as_written(tmp_path):
+    migration = tmp_path / "001_like.sql"
+    migration.write_text("CREATE TABLE t AS SELECT 'abc' AS v WHERE 'abc' LIKE 'a%' -- 100% of rows\n")
+    engine = create_engine(
+        "sqlite://", creator=lambda: sqlite3.connect(":memory:", factory=PsycopgLikeConnection)
+    )
+    _apply_migrations(engine, [migration])
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT v FROM t").scalar() == "abc"
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from tip.bus.sqs import BufferedSQSBus, SQSBus, SQSConfig
+
+
+class FakeSQSClient:
+    def __init__(self, fail_once: set[str] | None = None, fail_always: set[str] | None = None, sender_fault=False):
+        self.calls: list[list[dict]] = []
+        self.fail_once = set(fail_once or ())
+        self.fail_always = set(fail_always or ())
+        self.sender_fault = sender_fault
+
+    def send_message_batch(self, QueueUrl: str, Entries: list[dict]) -> dict:
+        self.calls.append(Entries)
+        ok, failed = [], []
+        for e in Entries:
+            if e["Id"] in self.fail_once or e["Id"] in self.fail_always:
+                self.fail_once.discard(e["Id"])
+                failed.append({"Id": e["Id"], "SenderFault": self.sender_fault, "Code": "InternalError"})
+            else:
+                ok.append({"Id": e["Id"], "MessageId": "m" + e["Id"]})
+        return {"Successful": ok, "Failed": failed}
+
+
+def make_bus(client: FakeSQSClient) -> SQSBus:
+    bus = SQSBus(SQSConfig(queue_url="https://sqs.local/q"))
+    bus.client = client
+    return bus
+
+
+def test_publish_many_chunks_into_batches_of_ten():
+    client = FakeSQSClient()
+    bus = make_bus(client)
+    sent = bus.publish_many([{"n": i} for i in range(23)])
+    assert sent == list(range(23))
+    assert [len(c) for c in client.calls] == [10, 10, 3]
+    assert json.loads(client.calls[2][0]["MessageBody"]) == {"n": 20}
+
+
+def test_publish_many_retries_failed_entries():
+    client = FakeSQSClient(fail_once={"1"})
+    bus = make_bus(client)
+    assert bus.publish_many([{"n": 0}, {"n": 1}]) == [0, 1]
+    assert [[e["Id"] for e in c] for c in client.calls] == [["0", "1"], ["1"]]
+
+
+def record_backoff(monkeypatch) -> list[float]:
+    from types import SimpleNamespace
+
+    from tip.bus import sqs
+
+    sleeps: list[float] = []
+    monkeypatch.setattr(sqs, "time", SimpleNamespace(sleep=sleeps.append, monotonic=time.monotonic))
+    monkeypatch.setattr(sqs, "random", SimpleNamespace(uniform=lambda low, high: high))
+    return sleeps
+
+
+def test_publish_many_backs_off_exponentially_between_retries(monkeypatch):
+    sleeps = record_backoff(monkeypatch)
+    client = FakeSQSClient(fail_always={"0"})
+    bus = make_bus(client)
+    assert bus.publish_many([{"n": 0}]) == []
+    assert len(client.calls) == bus.cfg.max_retries + 1
+    # One sleep between attempts, none after the last
+    assert sleeps == [0.1, 0.2, 0.4]
+
+
+def test_publish_many_does_not_retry_sender_faults(monkeypatch):
+    sleeps = record_backoff(monkeypatch)
+    client = FakeSQSClient(fail_always={"1"}, sender_fault=True)
+    bus = make_bus(client)
+    assert bus.publish_many([{"n": 0}, {"n": 1}]) == [0]
+    assert len(client.calls) == 1 and sleeps == []
+
+
+def test_buffered_bus_flush_sends_queued_messages_in_batches():
+    client = FakeSQSClient()
+    buffered = BufferedSQSBus(make_bus(client), linger_ms=50)
+    for i in range(12):
+        buffered.publish({"n": i})
+    buffered.flush()
+    buffered.close()
+    bodies = [json.loads(e["MessageBody"])["n"] for c in client.calls for e in c]
+    assert sorted(bodies) == list(range(12))
+    assert all(len(c) <= 10 for c in client.calls)
+    assert buffered.failed == 0
+
+
+def test_publish_many_splits_batches_at_256_kib():
+    client = FakeSQSClient()
+    bus = make_bus(client)
+    big = "x" * (100 * 1024)
+    assert bus.publish_many([{"s": big} for _ in range(5)]) == list(range(5))
+    assert [len(c) for c in client.calls] == [2, 2, 1]
+
+
+def test_buffered_bus_publish_blocks_when_max_queued_is_reached():
+    release = threading.Event()
+    sending = threading.Event()
+
+    class BlockingClient(FakeSQSClient):
+        def send_message_batch(self, QueueUrl: str, Entries: list[dict]) -> dict:
+            sending.set()
+            release.wait(5)
+            return super().send_message_batch(QueueUrl, Entries)
+
+    client = BlockingClient()
+    buffered = BufferedSQSBus(make_bus(client), max_batch=1, linger_ms=0, max_inflight_batches=1, max_queued=2)
+    published: list[int] = []
+
+    def produce() -> None:
+        for i in range(10):
+            buffered.publish({"n": i})
+            published.append(i)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        assert sending.wait(5)
+        # With the only in-flight slot held by the blocked send, message 1 waits in the
+        # worker for a slot and 2 and 3 fill the queue. Nothing drains until release,
+        # so once that state is reached the producer is stuck on message 4 for good.
+        deadline = time.monotonic() + 5
+        while (buffered._queue.qsize() < 2 or len(published) < 4) and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert buffered._queue.qsize() == 2
+        assert published == [0, 1, 2, 3]
+        assert producer.is_alive()
+    finally:
+        release.set()
+    producer.join(5)
+    buffered.flush()
+    buffered.close()
+    assert len(published) == 10
+    assert sorted(json.loads(c[0]["MessageBody"])["n"] for c in client.calls) == list(range(10))